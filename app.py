@@ -5,14 +5,18 @@ import datetime
 from pymongo import MongoClient
 from bson import ObjectId, errors
 from bson.objectid import ObjectId, InvalidId
-from utils.resume_parser import parse_resume
-from backend.extract_resume import extract_full_resume
 from backend.db_handler import save_to_db
+from utils.parse_session import create_session, get_session
+from utils.resume_document import open_document
+from utils.upload_store import UPLOAD_ROOT, MAX_UPLOAD_BYTES, MAX_UPLOAD_MB, accept_upload, flush_upload, stored_name, upload_path, resolve_upload
+from utils.model_registry import WARM_UP_MODELS, warm_up_in_background, readiness
 from routes import hr_bp  # Import the HR blueprint
 
 # Flask app setup
 flask_app = Flask(__name__)
-flask_app.config['UPLOAD_FOLDER'] = 'uploads/'
+flask_app.config['UPLOAD_FOLDER'] = UPLOAD_ROOT
+# Whole request: the resume plus the form fields sent with it
+flask_app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES + 1024 * 1024
 
 # Register the HR blueprint
 flask_app.register_blueprint(hr_bp, url_prefix='/hr')
@@ -22,6 +26,16 @@ client = MongoClient("mongodb://localhost:27017")
 db = client["resume_ranking_db"]
 collection = db["form_extractions"]
 
+# Models load on first use; production workers set WARM_UP_MODELS=1 and gate traffic on /ready
+if WARM_UP_MODELS:
+    warm_up_in_background()
+
+# Readiness probe: 503 until a requested model warm-up has finished
+@flask_app.route('/ready')
+def ready():
+    status = readiness()
+    return jsonify(status), 200 if status["ready"] else 503
+
 # Home route (empty form)
 @flask_app.route('/')
 def index():
@@ -41,11 +55,15 @@ def upload_resume():
         return render_template('form.html', form_data={}, resume_filename="", jd_id="", error_msg="Please select a resume file.")
     
     jd_id = request.form.get("jd_id")
-    filename = secure_filename(file.filename)
-    filepath = os.path.join(flask_app.config['UPLOAD_FOLDER'], filename)
-    file.save(filepath)
-
-    parsed_data = parse_resume(filepath)
+    # Parsed from the request bytes and stored under its content hash: same-named files never collide,
+    # repeat files are parsed once, and the disk write happens in the background
+    try:
+        sha256, parsed_data = accept_upload(file.stream, secure_filename(file.filename))
+    except ValueError as e:
+        return render_template('form.html', form_data={}, resume_filename="", jd_id=jd_id, error_msg=f"{e}.")
+    filename = stored_name(sha256)
+    # /submit attaches this extraction instead of parsing the resume again
+    upload_token = create_session(parsed_data, filename)
     
     # Map parsed data to form fields
     form_prefill = map_parsed_data_to_form(parsed_data)
@@ -57,6 +75,7 @@ def upload_resume():
         'form.html',
         form_data=form_prefill,
         resume_filename=filename,
+        upload_token=upload_token,
         jd_id=jd_id
     )
 
@@ -163,11 +182,11 @@ def upload_for_jd(jd_id):
         if file.filename == '':
             return render_template('form.html', jd_id=jd_id, prefill={}, error_msg="Please select a resume file before submitting.")
         
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(flask_app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-
-        parsed_data = parse_resume(filepath)
+        try:
+            sha256, parsed_data = accept_upload(file.stream, secure_filename(file.filename))
+        except ValueError as e:
+            return render_template('form.html', jd_id=jd_id, prefill={}, error_msg=f"{e}.")
+        filepath = upload_path(sha256)
 
         final_data = {
             **parsed_data,
@@ -202,8 +221,26 @@ def submit():
     filename = request.form.get("resume_filename")
     if not filename:
         return render_template('form.html', prefill=request.form, resume_filename="", jd_id=jd_id, error_msg="Resume upload is required. Please upload your resume before submitting.")
-    filepath = f"uploads/{filename}" if filename else None
-    extracted_info = extract_full_resume(filepath) if filepath else {}
+    # Extraction from /upload, no extractor runs again here
+    session = get_session(request.form.get("upload_token"), filename)
+    file = request.files.get("resume")
+    if not session and file and file.filename:
+        # Form submitted without auto-fill: store the posted file, parsed once per distinct content
+        try:
+            sha256, parsed_data = accept_upload(file.stream, secure_filename(file.filename))
+        except ValueError as e:
+            return render_template('form.html', prefill=request.form, resume_filename="", jd_id=jd_id, error_msg=f"{e}.")
+        filename = stored_name(sha256)
+        session = {"parsed_data": parsed_data, "resume_sha256": sha256}
+    filepath = resolve_upload(filename)
+    if session:
+        raw_extraction = session["parsed_data"]
+        resume_sha256 = session["resume_sha256"]
+    else:
+        # Expired or missing token: only the stored document's hash, never a re-parse
+        print("⚠️ No parse session for upload, submitting without raw extraction")
+        raw_extraction = None
+        resume_sha256 = open_document(filepath).sha256 if os.path.exists(filepath) else None
     print("📁 Filename from form:", filename)
     print("📁 Final filepath:", filepath)
 
@@ -234,6 +271,8 @@ def submit():
             "website": request.form.get("website")
         },
         "resume_filepath": filepath,
+        "resume_sha256": resume_sha256,
+        "raw_extraction": raw_extraction,
         "jd_id": jd_object_id,
         "submitted_at": datetime.datetime.utcnow()
     }
@@ -256,7 +295,15 @@ def submit():
 # Serve uploaded files
 @flask_app.route('/uploads/<filename>')
 def serve_upload(filename):
-    return send_from_directory('uploads', filename)
+    filepath = resolve_upload(filename)
+    # A file accepted a moment ago may still be on its way to disk
+    flush_upload(os.path.basename(filepath)[:-len(".pdf")])
+    return send_from_directory(os.path.dirname(filepath), os.path.basename(filepath))
+
+# Reject oversized uploads before the body is read
+@flask_app.errorhandler(413)
+def upload_too_large(error):
+    return render_template('form.html', form_data={}, resume_filename="", jd_id=request.args.get("jd_id", ""), error_msg=f"Resume is larger than {MAX_UPLOAD_MB:g} MB."), 413
 
 # Serve PDF files
 @flask_app.route('/pdfs/<filename>')
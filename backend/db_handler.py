@@ -1,14 +1,59 @@
+import os
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pymongo import MongoClient
 from datetime import datetime, timezone
+from utils.upload_store import add_reference
+
+# Threads embedding and scoring saved applications off the request path
+INDEX_WORKERS = int(os.environ.get("INDEX_WORKERS", "1"))
 
 # Connect to MongoDB
 client = MongoClient("mongodb://localhost:27017/")
 db = client["resume_ranking_db"]
 collection = db["form_extractions"]
 
+_indexer = None
+_indexer_lock = threading.Lock()
+
+def _get_indexer():
+    global _indexer
+    with _indexer_lock:
+        if _indexer is None:
+            _indexer = ThreadPoolExecutor(max_workers=INDEX_WORKERS, thread_name_prefix="resume-indexer")
+    return _indexer
+
 # Function to save extracted form data
 def save_to_db(data: dict):
     data["submitted_at"] = datetime.now(timezone.utc)
     result = collection.insert_one(data)
     print("✅ Saved to DB! ID:", result.inserted_id)
+    if data.get("resume_sha256"):
+        add_reference(data["resume_sha256"])
+    # SBERT encode, ANN insert and scoring run in the background, a leaderboard read
+    # catches up on any application whose scoring has not landed yet
+    _get_indexer().submit(_index_application, result.inserted_id, copy.deepcopy(data))
     return str(result.inserted_id)
+
+def _index_application(resume_id, data):
+    index_resume_embedding(resume_id, data)
+    update_jd_leaderboard(resume_id, data)
+
+# Embed the resume once and add it to the candidate search index
+def index_resume_embedding(resume_id, data):
+    from utils.candidate_search import index_resume
+
+    try:
+        index_resume(resume_id, data)
+    except Exception as e:
+        print("⚠️ Could not index resume embedding:", e)
+
+# Score the application once and insert it into its JD leaderboard
+def update_jd_leaderboard(resume_id, data):
+    from utils.leaderboard import add_application
+
+    try:
+        add_application(resume_id, data)
+    except Exception as e:
+        print("⚠️ Could not update JD leaderboard:", e)
\ No newline at end of file
@@ -1,11 +1,7 @@
-import fitz  # PyMuPDF
+from utils.resume_document import open_document
 
 def extract_text_from_pdf(pdf_path):
-    text = ""
-    with fitz.open(pdf_path) as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
+    return open_document(pdf_path).text
 
 # Import all your extractors
 from utils.extractors.personal import extract_personal
@@ -18,13 +14,15 @@ from utils.extractors.experience import extract_experience
 
 # ✅ THIS IS THE FIXED FUNCTION
 def extract_full_resume(pdf_path):
-    text = extract_text_from_pdf(pdf_path)  # Get the text from the PDF
+    document = open_document(pdf_path)  # Stored parse of the PDF, opened at most once
+    text = document.text
     return {
         "personal_details": extract_personal(text),
         "education": extract_education(text),
         "work": extract_work(text),
         "skills": extract_skills(text),
-        "links": extract_links(text),
+        "links": extract_links(text, uris=document.uris),
         "projects": extract_projects(text),
-        "experience": extract_experience(text)
+        "experience": extract_experience(text),
+        "resume_sha256": document.sha256
     }
@@ -0,0 +1,23 @@
+import re
+import time
+from utils.lexicon import LEXICON_PATH, build_lexicon, save_lexicon
+from utils.ranking_utils import DOMAIN_KNOWLEDGE
+
+def domain_vocabulary():
+    """Single-word tokens appearing in DOMAIN_KNOWLEDGE keys and expansions"""
+    words = set()
+    for key, terms in DOMAIN_KNOWLEDGE.items():
+        for phrase in [key, *terms]:
+            words.update(w for w in re.split(r'\s+', phrase.lower()) if len(w) >= 3)
+    return words
+
+def main():
+    """Precompile the synonym lexicon used by semantic_expansion"""
+    print("📚 Building synonym lexicon from WordNet + DOMAIN_KNOWLEDGE")
+    start = time.time()
+    lexicon = build_lexicon(extra_words=domain_vocabulary())
+    save_lexicon(lexicon)
+    print(f"✅ {len(lexicon['synonyms'])} entries written to {LEXICON_PATH} in {time.time() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import time
+from utils.embedding_store import MODEL_NAME
+from utils.inference_backend import NER_MODEL_ID, export_quantized, hub_model_id
+
+def main():
+    """Export int8-quantized ONNX versions of the ranking and NER models (INFERENCE_BACKEND=onnx)"""
+    for model_id, task in [(hub_model_id(MODEL_NAME), "feature-extraction"), (NER_MODEL_ID, "token-classification")]:
+        print(f"📦 Exporting {model_id} ({task})")
+        start = time.time()
+        path = export_quantized(model_id, task)
+        print(f"✅ Written to {path} in {time.time() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import time
+import argparse
+from utils.bulk_ingest import INGEST_WORKERS, INGEST_BATCH_SIZE, ingest
+
+def wait_for_rank_job(job_id, poll_seconds=5):
+    """Print the leaderboard job's progress until it finishes, returns its final status"""
+    from utils.rank_jobs import get_job_status
+
+    while True:
+        status = get_job_status(job_id)
+        if status["status"] in ("done", "failed"):
+            return status
+        if status["total"] is not None:
+            print(f"📈 Scored {status['scored']}/{status['total']} applications")
+        time.sleep(poll_seconds)
+
+def main():
+    """Bulk-ingest a directory or zip of resume PDFs as applications to one JD (e.g. a campus drive)"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("source", help="directory (searched recursively) or .zip of PDFs")
+    parser.add_argument("jd_id", help="JD the resumes apply to")
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS, help="parser processes")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE, help="applications per insert_many")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: next to the source)")
+    parser.add_argument("--no-index", action="store_true", help="skip adding embeddings to the candidate search index")
+    parser.add_argument("--no-score", action="store_true", help="leave leaderboard scoring to a later rank job")
+    args = parser.parse_args()
+
+    print(f"📥 Ingesting {args.source} for JD {args.jd_id} with {args.workers} workers")
+    stats = ingest(
+        args.source, args.jd_id, workers=args.workers, batch_size=args.batch_size,
+        checkpoint=args.checkpoint, index=not args.no_index, score=not args.no_score
+    )
+    print(f"✅ {stats['inserted']} inserted, {stats['duplicates']} duplicates, {stats['failed']} failed "
+          f"in {stats['seconds']}s ({stats['files_per_second']} files/s)")
+
+    if stats["rank_job_id"]:
+        # The job runs in this process's pool, which has to stay up until it is done
+        print(f"🔄 Scoring the JD leaderboard in rank job {stats['rank_job_id']}")
+        status = wait_for_rank_job(stats["rank_job_id"])
+        if status["status"] == "done":
+            print(f"✅ Leaderboard ready with {len(status['results'])} candidates")
+        else:
+            print(f"❌ Leaderboard scoring failed: {status.get('error')}")
+
+if __name__ == "__main__":
+    main()
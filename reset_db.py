@@ -1,22 +1,39 @@
 from pymongo import MongoClient
+from collections import Counter
 import os
+from utils.upload_store import release_reference, prune_unreferenced
 
 client = MongoClient("mongodb://localhost:27017/")
 db = client["resume_ranking_db"]
 
-# Delete all resumes
+# Delete all resumes, releasing the uploaded files they point at
+references = Counter(
+    doc["resume_sha256"] for doc in db["form_extractions"].find({"resume_sha256": {"$ne": None}}, {"resume_sha256": 1})
+)
 form_result = db["form_extractions"].delete_many({})
+released = sum(release_reference(sha256, count) for sha256, count in references.items())
 # Delete all JDs
 jd_result = db["jd_extractions"].delete_many({})
+# Uploads never submitted with an application
+pruned = prune_unreferenced(older_than_hours=0)
+# Scores and ranking jobs of the deleted applications (JD PDFs stay on disk)
+leaderboard_result = db["jd_leaderboards"].delete_many({})
+job_result = db["rank_jobs"].delete_many({})
 
 print(f"✅ Deleted {form_result.deleted_count} resumes from form_extractions.")
 print(f"✅ Deleted {jd_result.deleted_count} JDs from jd_extractions.")
+print(f"✅ Removed {released + pruned} uploaded files.")
+print(f"✅ Deleted {leaderboard_result.deleted_count} leaderboard entries and {job_result.deleted_count} ranking jobs.")
 
 # Delete export files
 for fname in [
     "comprehensive_resume_data.json",
     "comprehensive_resumes.csv",
-    "submissions.csv"
+    "submissions.csv",
+    "indexes/resume_ivf.npz",
+    "indexes/resume_ivf_full.npy",
+    "indexes/resume_ivf.delta",
+    "indexes/resume_ivf.delta.lock"
 ]:
     if os.path.exists(fname):
         os.remove(fname)
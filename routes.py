@@ -1,8 +1,15 @@
-from flask import Blueprint, render_template, request, redirect, url_for, send_from_directory
+from flask import Blueprint, render_template, request, redirect, url_for, send_from_directory, jsonify
 from pymongo import MongoClient
 from bson import ObjectId
+from bson.errors import InvalidId
 import pdfkit
 import os
+import math
+
+# Candidates per page of ranked_resumes.html, highlights are only generated for the visible page
+RESULTS_PER_PAGE = 20
+# Unscored applications a page view scores itself, a larger backlog goes to a background rank job
+INLINE_SCORING_LIMIT = int(os.environ.get("INLINE_SCORING_LIMIT", "16"))
 
 # Blueprint setup
 hr_bp = Blueprint("hr", __name__)
@@ -81,6 +88,14 @@ def submit_jd():
     pdfkit.from_string(internal_html, internal_path)
     pdfkit.from_string(public_html, public_path)
 
+    # 🧠 Embed the JD once so ranking only reads the stored vector
+    try:
+        from utils.resume_document import open_document
+        from utils.ranking_utils import precompute_embedding
+        precompute_embedding(open_document(internal_path).cleaned_text)
+    except Exception as e:
+        print("⚠️ Could not precompute JD embedding:", e)
+
     return f"""
     ✅ JD saved successfully!<br><br>
     🔒 <a href='/pdfs/JD_{inserted_id}_internal.pdf' target='_blank'>Download Internal JD PDF</a><br>
@@ -103,43 +118,171 @@ def view_resumes(jd_id):
 
     return render_template("submitted_resumes.html", resumes=resumes, jd_id=jd_id, total_resumes=total_resumes)
 
+def parse_weights(value):
+    """'semantic:0.6,tfidf:0.3,term_overlap:0.1' -> {component: weight}, omitted components keep their default"""
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition(":")
+        name = name.strip()
+        if name not in ("semantic", "tfidf", "term_overlap"):
+            raise ValueError(f"unknown score component {name!r}")
+        weights[name] = float(weight)
+        # float() accepts 'nan' and 'inf', which would poison every score
+        if not math.isfinite(weights[name]):
+            raise ValueError(f"non-finite weight for {name}")
+        if weights[name] < 0:
+            raise ValueError(f"negative weight for {name}")
+    return weights
+
+def parse_scaling(args):
+    """scale_max/scale_power query args -> scale_scores kwargs, both must be finite and positive"""
+    scaling = {}
+    for key, arg in (("max_val", "scale_max"), ("power", "scale_power")):
+        if args.get(arg):
+            scaling[key] = float(args[arg])
+            if not math.isfinite(scaling[key]) or scaling[key] <= 0:
+                raise ValueError(f"{arg} must be a positive number")
+    return scaling
+
 @hr_bp.route("/rank_resumes/<jd_id>")
 def rank_resumes_for_jd(jd_id):
+    from utils.leaderboard import load_jd_text, pending_applications, get_leaderboard, reweight_leaderboard, attach_highlights
+    from utils.rank_jobs import submit_rank_job
+
+    jd_text = load_jd_text(jd_id)
+    if jd_text is None:
+        return "JD PDF not found", 404
+
+    if request.args.get("mode") == "cascade":
+        return rank_resumes_cascade_view(jd_id, jd_text)
+
+    # Optional re-weighting/re-scaling, e.g. ?weights=semantic:0.6,tfidf:0.2,term_overlap:0.2&scale_max=0.5
+    try:
+        weights = parse_weights(request.args["weights"]) if request.args.get("weights") else None
+        scaling = parse_scaling(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"❌ Invalid weights: {e}"}), 400
+
+    # Scores are computed once per application and kept sorted in the leaderboard
+    pending = pending_applications(ObjectId(jd_id), jd_text)
+    if len(pending) > INLINE_SCORING_LIMIT:
+        # New JD, bulk import or scoring version bump: score in a job, the page polls it and reloads
+        job_id = submit_rank_job(jd_id)
+        return render_template(
+            "ranked_resumes.html", results=[], jd_id=jd_id, total=len(pending),
+            job_id=job_id, status_url=url_for("hr.rank_job_status", job_id=job_id)
+        )
+    entries = get_leaderboard(ObjectId(jd_id), jd_text, pending=pending)
+    if weights or scaling:
+        # Pure array math over the stored raw components, nothing is recomputed
+        entries = reweight_leaderboard(entries, weights=weights, scaling=scaling)
+
+    per_page = max(1, request.args.get("per_page", RESULTS_PER_PAGE, type=int))
+    pages = max(1, -(-len(entries) // per_page))
+    page = min(max(1, request.args.get("page", 1, type=int)), pages)
+    visible = attach_highlights(jd_text, entries[(page - 1) * per_page:page * per_page])
+    results = [{
+        "name": entry.get("name", "Unnamed"),
+        "email": entry.get("email", ""),
+        "filepath": entry.get("filepath"),
+        "score": entry["score"],
+        "reasoning": entry.get("reasoning", ""),
+        "highlights": entry.get("highlights") or []
+    } for entry in visible]
+
+    def page_url(number):
+        return url_for("hr.rank_resumes_for_jd", jd_id=jd_id, **{**request.args.to_dict(), "page": number})
+
+    return render_template(
+        "ranked_resumes.html", results=results, jd_id=jd_id, total=len(entries),
+        page=page, pages=pages,
+        prev_url=page_url(page - 1) if page > 1 else None,
+        next_url=page_url(page + 1) if page < pages else None
+    )
+
+def rank_resumes_cascade_view(jd_id, jd_text):
+    """Live two-stage ranking: lexical prefilter for all, SBERT only for the shortlist"""
     from app import collection
-    import os
-    from bson import ObjectId
-    from utils.resume_text_utils import extract_text_from_pdf, clean_text
-    from utils.ranking_utils import rank_resumes_with_reasoning
+    from utils.leaderboard import load_resume_texts
+    from utils.ranking_utils import rank_resumes_cascade
 
-    jd_path = f"pdfs/JD_{jd_id}_internal.pdf"
+    jd_data = jd_collection.find_one({"_id": ObjectId(jd_id)}) or {}
+    resumes, resume_texts = load_resume_texts(collection.find({"jd_id": ObjectId(jd_id)}))
+    ranking = rank_resumes_cascade(
+        jd_text,
+        resume_texts,
+        no_of_candidates=jd_data.get("no_of_candidates"),
+        shortlist_size=request.args.get("shortlist", type=int)
+    )
 
-    if not os.path.exists(jd_path):
-        return "JD PDF not found", 404
+    results = [{
+        "name": resumes[i].get("personal_details", {}).get("name", "Unnamed"),
+        "email": resumes[i].get("personal_details", {}).get("email", ""),
+        "filepath": resumes[i].get("resume_filepath"),
+        "score": float(ranking["scores"][i]),
+        "reasoning": ranking["reasoning"][i],
+        "highlights": ranking["highlights"][i]
+    } for i in ranking["order"]]
 
-    jd_text = clean_text(extract_text_from_pdf(jd_path))
+    return render_template("ranked_resumes.html", results=results, jd_id=jd_id)
 
-    resumes = list(collection.find({"jd_id": ObjectId(jd_id)}))
-    results = []
+@hr_bp.route("/rank_jobs/<jd_id>", methods=["POST"])
+def start_rank_job(jd_id):
+    from utils.rank_jobs import submit_rank_job
 
-    for resume in resumes:
-        filepath = resume.get("resume_filepath")
-        if not filepath or not os.path.exists(filepath):
-            continue
+    try:
+        job_id = submit_rank_job(jd_id)
+    except InvalidId:
+        return jsonify({"error": "❌ Invalid JD ID"}), 400
+    return jsonify({"job_id": job_id, "status_url": url_for("hr.rank_job_status", job_id=job_id)}), 202
+
+@hr_bp.route("/rank_jobs/status/<job_id>")
+def rank_job_status(job_id):
+    from utils.rank_jobs import get_job_status
+
+    try:
+        status = get_job_status(job_id)
+    except InvalidId:
+        return jsonify({"error": "❌ Invalid job ID"}), 400
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(status)
 
-        resume_text = clean_text(extract_text_from_pdf(filepath))
-        ranking_result = rank_resumes_with_reasoning(jd_text, resume_text)
+@hr_bp.route("/candidate_search/<jd_id>")
+def candidate_search(jd_id):
+    """Top-K candidates for a JD across the whole resume pool, not only its applicants"""
+    from app import collection
+    from utils.resume_document import open_document
+    from utils.candidate_search import search_candidates
+
+    jd_path = f"pdfs/JD_{jd_id}_internal.pdf"
+    if not os.path.exists(jd_path):
+        return jsonify({"error": "JD PDF not found"}), 404
 
-        results.append({
+    # search clamps to the pool size, anything below 1 means the default page of one
+    k = max(1, request.args.get("k", default=20, type=int))
+    jd_text = open_document(jd_path).cleaned_text
+    matches = search_candidates(jd_text, k=k)
+
+    resumes = {
+        str(resume["_id"]): resume
+        for resume in collection.find({"_id": {"$in": [ObjectId(resume_id) for resume_id, _ in matches]}})
+    }
+    candidates = []
+    for resume_id, score in matches:
+        resume = resumes.get(resume_id)
+        if not resume:
+            continue
+        candidates.append({
+            "resume_id": resume_id,
             "name": resume.get("personal_details", {}).get("name", "Unnamed"),
             "email": resume.get("personal_details", {}).get("email", ""),
-            "filepath": filepath,
-            "score": ranking_result["score"],
-            "reasoning": ranking_result["reasoning"],
-            "highlights": ranking_result["highlights"]
+            "filepath": resume.get("resume_filepath"),
+            "applied_jd_id": str(resume.get("jd_id")) if resume.get("jd_id") else None,
+            "score": round(score, 4)
         })
 
-    results = sorted(results, key=lambda x: x["score"], reverse=True)
-    return render_template("ranked_resumes.html", results=results, jd_id=jd_id)
+    return jsonify({"jd_id": jd_id, "candidates": candidates})
 
 @hr_bp.route("/hr_dashboard")
 def hr_dashboard():
@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import numpy as np
+from utils.ann_index import IVFFlatIndex, BASE_PATH, FULL_PATH, RESCORE_FACTOR
+
+# Bounded effect on ranking: the rescored top-k must match exact float32 search this closely
+MIN_RESCORED_RECALL = 0.95
+MIN_RESCORED_ORDER_KEPT = 0.95
+# Memory saving over float32, including the per-vector scale and list assignment
+MIN_COMPRESSION = {"int8": 3.0, "float16": 1.9}
+
+def synthetic_vectors(n, dim=384, clusters=64, seed=0):
+    """Clustered unit vectors standing in for resume embeddings when no index exists yet"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(clusters, size=n)] + 0.6 * rng.normal(size=(n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def rank_agreement(reference, candidate):
+    """Share of adjacent reference pairs whose order the candidate ranking keeps"""
+    positions = {resume_id: i for i, resume_id in enumerate(candidate)}
+    pairs = [(a, b) for a, b in zip(reference, reference[1:]) if a in positions and b in positions]
+    if not pairs:
+        return 1.0
+    return sum(positions[a] < positions[b] for a, b in pairs) / len(pairs)
+
+def test_ann_quantization(k=20, queries=50, storage="int8"):
+    """Memory per vector and top-k agreement of compact storage against exact float32 search"""
+    print(f"🧪 Testing {storage} ANN Storage")
+    print("=" * 50)
+
+    if os.path.exists(BASE_PATH) and os.path.exists(FULL_PATH):
+        vectors = np.asarray(np.load(FULL_PATH, mmap_mode="r"), dtype=np.float32)
+        print(f"📊 Using stored resume index: {len(vectors)} vectors")
+    else:
+        vectors = synthetic_vectors(20000)
+        print(f"⚠️ No resume index at {BASE_PATH}, using {len(vectors)} synthetic vectors")
+
+    ids = [f"{i:024x}" for i in range(len(vectors))]
+    index = IVFFlatIndex(vectors.shape[1], storage=storage)
+    index.add(ids, vectors)
+    index.train()
+
+    rng = np.random.default_rng(1)
+    query_vectors = vectors[rng.choice(len(vectors), min(queries, len(vectors)), replace=False)]
+    query_vectors = query_vectors + 0.05 * rng.normal(size=query_vectors.shape).astype(np.float32)
+
+    recall = {"approx": [], "rescored": []}
+    agreement = {"approx": [], "rescored": []}
+    timings = {"approx": 0.0, "rescored": 0.0}
+    for query in query_vectors:
+        exact = [ids[i] for i in np.argsort(-(vectors @ (query / np.linalg.norm(query))), kind="stable")[:k]]
+        for name, rescore in (("approx", False), ("rescored", True)):
+            start = time.time()
+            # Probing every list isolates the effect of quantization from the IVF approximation
+            found = [resume_id for resume_id, _ in index.search(query, k=k, nprobe=len(vectors), rescore=rescore)]
+            timings[name] += time.time() - start
+            recall[name].append(len(set(exact) & set(found)) / k)
+            agreement[name].append(rank_agreement(exact, found))
+
+    float32_bytes = vectors.nbytes
+    print("📈 MEMORY REPORT:")
+    print("-" * 30)
+    print(f"   float32:  {float32_bytes / len(vectors):.0f} bytes/vector")
+    print(f"   {storage}:{' ' * (9 - len(storage))}{index.memory_bytes() / len(vectors):.0f} bytes/vector ({float32_bytes / index.memory_bytes():.1f}x smaller)")
+
+    print("\n📈 RANKING REPORT:")
+    print("-" * 30)
+    for name in ("approx", "rescored"):
+        label = "compact only" if name == "approx" else f"rescored x{RESCORE_FACTOR}"
+        print(f"   {label}: recall@{k} {np.mean(recall[name]):.3f} | "
+              f"order kept {np.mean(agreement[name]):.3f} | "
+              f"{1000 * timings[name] / len(query_vectors):.1f} ms/query")
+
+    compression = float32_bytes / index.memory_bytes()
+    rescored_recall = np.mean(recall["rescored"])
+    rescored_order = np.mean(agreement["rescored"])
+    passed = (
+        rescored_recall >= MIN_RESCORED_RECALL and rescored_order >= MIN_RESCORED_ORDER_KEPT
+        and compression >= MIN_COMPRESSION[storage]
+    )
+    print(f"\n{'✅' if passed else '❌'} Rescored recall@{k} >= {MIN_RESCORED_RECALL}, "
+          f"order kept >= {MIN_RESCORED_ORDER_KEPT}, {MIN_COMPRESSION[storage]}x smaller than float32")
+    assert rescored_recall >= MIN_RESCORED_RECALL, f"rescored recall@{k} {rescored_recall:.3f}"
+    assert rescored_order >= MIN_RESCORED_ORDER_KEPT, f"rescored order kept {rescored_order:.3f}"
+    assert compression >= MIN_COMPRESSION[storage], f"{storage} only {compression:.2f}x smaller than float32"
+
+if __name__ == "__main__":
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    storage = sys.argv[2] if len(sys.argv) > 2 else "int8"
+    test_ann_quantization(k=k, storage=storage)
@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+import numpy as np
+from pymongo import MongoClient
+from bson import ObjectId
+from utils.resume_text_utils import extract_text_from_pdf, clean_text
+from utils.leaderboard import load_resume_texts
+from utils.ranking_utils import rank_resumes_bulk, rank_resumes_cascade, cascade_shortlist_size
+
+def recall_at_k(reference_order, candidate_order, k):
+    """Share of the reference top-k that also appears in the candidate top-k"""
+    k = min(k, len(reference_order))
+    if k == 0:
+        return 1.0
+    return len(set(reference_order[:k]) & set(candidate_order[:k])) / k
+
+def test_cascade_recall(test_jd_id="6856ec25ac1437f92281ec1c", shortlist_size=None):
+    """Compare cascade ranking against the full pipeline: recall@K and wall time"""
+    print("🧪 Testing Cascade Ranking Recall")
+    print("=" * 50)
+
+    # MongoDB setup
+    client = MongoClient("mongodb://localhost:27017")
+    db = client["resume_ranking_db"]
+    collection = db["form_extractions"]
+    jd_collection = db["jd_extractions"]
+
+    # JD PDF path
+    jd_path = f"pdfs/JD_{test_jd_id}_internal.pdf"
+
+    if not os.path.exists(jd_path):
+        print(f"❌ JD PDF not found: {jd_path}")
+        return
+
+    jd_text = clean_text(extract_text_from_pdf(jd_path))
+    jd_data = jd_collection.find_one({"_id": ObjectId(test_jd_id)}) or {}
+    no_of_candidates = jd_data.get("no_of_candidates")
+
+    resumes, resume_texts = load_resume_texts(collection.find({"jd_id": ObjectId(test_jd_id)}))
+    print(f"📊 Found {len(resumes)} resumes for JD {test_jd_id}")
+    if not resumes:
+        print("❌ No resumes found for this JD")
+        return
+
+    m = cascade_shortlist_size(len(resume_texts), no_of_candidates, shortlist_size)
+    print(f"🎯 no_of_candidates: {no_of_candidates} | shortlist M: {m}")
+    print()
+
+    start = time.time()
+    full = rank_resumes_bulk(jd_text, resume_texts)
+    full_time = time.time() - start
+
+    start = time.time()
+    cascade = rank_resumes_cascade(jd_text, resume_texts, no_of_candidates=no_of_candidates, shortlist_size=shortlist_size)
+    cascade_time = time.time() - start
+
+    full_order = list(np.argsort(-full["scores"], kind="stable"))
+    cascade_order = list(cascade["order"])
+
+    print("📈 RECALL REPORT:")
+    print("-" * 30)
+    ks = sorted({5, 10, 20, m} | ({int(no_of_candidates)} if str(no_of_candidates or "").isdigit() else set()))
+    for k in ks:
+        print(f"   recall@{k}: {recall_at_k(full_order, cascade_order, k):.3f}")
+    print(f"   Full pipeline: {full_time:.2f}s")
+    print(f"   Cascade:       {cascade_time:.2f}s ({full_time / max(cascade_time, 1e-9):.1f}x faster)")
+
+    print(f"\n✅ Cascade recall report completed for JD {test_jd_id}")
+
+if __name__ == "__main__":
+    jd_id = sys.argv[1] if len(sys.argv) > 1 else "6856ec25ac1437f92281ec1c"
+    shortlist = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    test_cascade_recall(jd_id, shortlist)
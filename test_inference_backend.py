@@ -0,0 +1,86 @@
+import glob
+import sys
+import time
+import numpy as np
+from utils.resume_text_utils import extract_text_from_pdf, clean_text
+from utils.embedding_store import MODEL_NAME
+from utils.inference_backend import get_sentence_encoder, get_ner_pipeline
+
+# Largest accepted |score delta| between the PyTorch and int8 ONNX backends
+SCORE_TOLERANCE = 0.03
+
+def load_texts(pattern="uploads/**/*.pdf"):
+    """Cleaned text of every uploaded resume, flat legacy files and sharded uploads/ab/cd/<sha256>.pdf alike"""
+    paths = sorted(glob.glob(pattern, recursive=True))
+    return [text for text in (clean_text(extract_text_from_pdf(path)) for path in paths) if text]
+
+def cosine_scores(encoder, jd_text, texts):
+    vectors = encoder.encode([jd_text] + texts, batch_size=32, convert_to_numpy=True)
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors[1:] @ vectors[0]
+
+def throughput(fn, items, repeats=3):
+    """Items per second, best of a few runs after one warm-up call"""
+    fn(items[:1])
+    best = min(_timed(fn, items) for _ in range(repeats))
+    return len(items) / max(best, 1e-9)
+
+def _timed(fn, items):
+    start = time.time()
+    fn(items)
+    return time.time() - start
+
+def test_inference_backend(jd_path=None):
+    """Parity of int8 ONNX against PyTorch (semantic scores, NER entities) and their throughput"""
+    print("🧪 Testing ONNX Runtime Inference Backend")
+    print("=" * 50)
+
+    texts = load_texts()
+    if not texts:
+        print("❌ No resume PDFs found in uploads/")
+        return
+    jd_path = jd_path or (sorted(glob.glob("pdfs/JD_*_internal.pdf")) or [None])[0]
+    jd_text = clean_text(extract_text_from_pdf(jd_path)) if jd_path else texts[0]
+    print(f"📊 {len(texts)} resumes | JD: {jd_path or 'first resume'}")
+
+    torch_encoder = get_sentence_encoder(MODEL_NAME, backend="torch")
+    onnx_encoder = get_sentence_encoder(MODEL_NAME, backend="onnx")
+    torch_scores = cosine_scores(torch_encoder, jd_text, texts)
+    onnx_scores = cosine_scores(onnx_encoder, jd_text, texts)
+    deltas = np.abs(torch_scores - onnx_scores)
+    same_order = list(np.argsort(-torch_scores, kind="stable")) == list(np.argsort(-onnx_scores, kind="stable"))
+
+    print("\n📈 SEMANTIC PARITY:")
+    print("-" * 30)
+    print(f"   max |delta|: {deltas.max():.4f} | mean |delta|: {deltas.mean():.4f} (tolerance {SCORE_TOLERANCE})")
+    print(f"   Ranking order identical: {'✅' if same_order else '⚠️ no'}")
+
+    # NER is only used on project sections, a few hundred characters is representative
+    snippets = [text[:512] for text in texts]
+    torch_ner = get_ner_pipeline(backend="torch")
+    onnx_ner = get_ner_pipeline(backend="onnx")
+    agreement = []
+    for snippet in snippets:
+        expected = {(e["entity_group"], e["word"]) for e in torch_ner(snippet)}
+        found = {(e["entity_group"], e["word"]) for e in onnx_ner(snippet)}
+        agreement.append(len(expected & found) / len(expected | found) if expected | found else 1.0)
+
+    print("\n📈 NER PARITY:")
+    print("-" * 30)
+    print(f"   mean entity Jaccard: {np.mean(agreement):.3f} | min: {np.min(agreement):.3f}")
+
+    print("\n📈 THROUGHPUT:")
+    print("-" * 30)
+    torch_rate = throughput(lambda items: torch_encoder.encode(items, batch_size=32), texts)
+    onnx_rate = throughput(lambda items: onnx_encoder.encode(items, batch_size=32), texts)
+    print(f"   SBERT  torch: {torch_rate:.1f} docs/s | onnx-int8: {onnx_rate:.1f} docs/s ({onnx_rate / torch_rate:.2f}x)")
+    torch_rate = throughput(lambda items: [torch_ner(s) for s in items], snippets)
+    onnx_rate = throughput(lambda items: [onnx_ner(s) for s in items], snippets)
+    print(f"   NER    torch: {torch_rate:.1f} docs/s | onnx-int8: {onnx_rate:.1f} docs/s ({onnx_rate / torch_rate:.2f}x)")
+
+    passed = deltas.max() <= SCORE_TOLERANCE
+    print(f"\n{'✅' if passed else '❌'} Semantic score deltas {'within' if passed else 'exceed'} tolerance {SCORE_TOLERANCE}")
+    assert passed, f"semantic score delta {deltas.max():.4f} exceeds {SCORE_TOLERANCE}"
+
+if __name__ == "__main__":
+    test_inference_backend(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,63 @@
+import numpy as np
+from utils.ranking_utils import SCORING_WEIGHTS, combine_component_scores, generate_reasoning_enhanced
+from utils.leaderboard import reweight_leaderboard
+
+def stored_entries(raw_semantic, raw_tfidf, raw_overlap, common_terms):
+    """Leaderboard entries as score_resumes stores them, without a database or model"""
+    combined = combine_component_scores(raw_semantic, raw_tfidf, raw_overlap, common_terms)
+    entries = []
+    for i in range(len(raw_semantic)):
+        result = {
+            'final_score': combined['final_score'][i],
+            'semantic_score': combined['semantic_score'][i],
+            'tfidf_score': combined['tfidf_score'][i],
+            'term_overlap_score': combined['term_overlap_score'][i],
+            'common_terms': common_terms[i]
+        }
+        entries.append({
+            "resume_id": i,
+            "score": float(combined['final_score'][i]),
+            "raw_scores": {
+                "semantic": float(raw_semantic[i]),
+                "tfidf": float(raw_tfidf[i]),
+                "term_overlap": float(raw_overlap[i])
+            },
+            "common_terms": common_terms[i],
+            "reasoning": generate_reasoning_enhanced(None, None, result)
+        })
+    return entries
+
+def test_reweight():
+    """Re-weighting with the default weights must reproduce the stored scores and reasoning exactly"""
+    print("🧪 Testing Leaderboard Re-weighting")
+    print("=" * 50)
+    rng = np.random.default_rng(0)
+    n = 200
+    raw_semantic = np.concatenate([[0.35], rng.uniform(0, 0.6, n - 1)])
+    raw_tfidf = np.concatenate([[0.2], rng.uniform(0, 0.4, n - 1)])
+    raw_overlap = np.concatenate([[0.3], rng.uniform(0, 0.8, n - 1)])
+    common_terms = [sorted(rng.choice(["python", "sql", "docker", "react", "aws"], 3, replace=False)) for _ in range(n)]
+    entries = stored_entries(raw_semantic, raw_tfidf, raw_overlap, common_terms)
+
+    reweighted = {entry["resume_id"]: entry for entry in reweight_leaderboard(entries, weights=dict(SCORING_WEIGHTS))}
+    mismatches = [
+        entry["resume_id"] for entry in entries
+        if reweighted[entry["resume_id"]]["reasoning"] != entry["reasoning"]
+        or reweighted[entry["resume_id"]]["score"] != entry["score"]
+    ]
+    print(f"{'✅' if not mismatches else '❌'} Default weights: {n - len(mismatches)}/{n} entries identical")
+    print(f"   {entries[0]['reasoning']}")
+
+    # A custom scaling moves the final score only, the component numbers keep their display scaling
+    rescaled = {entry["resume_id"]: entry for entry in reweight_leaderboard(entries, scaling={"max_val": 0.6})}
+    components_kept = all(
+        rescaled[entry["resume_id"]]["reasoning"].split(" | ")[1:] == entry["reasoning"].split(" | ")[1:]
+        for entry in entries
+    )
+    print(f"{'✅' if components_kept else '❌'} Custom scaling leaves the component breakdown unchanged")
+
+    assert not mismatches, f"{len(mismatches)} entries differ after a default re-weight"
+    assert components_kept, "custom scaling changed the component breakdown"
+
+if __name__ == "__main__":
+    test_reweight()
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+import time
+
+# Modules that must import without loading any model
+MODULES = ["app", "routes", "utils.resume_parser", "utils.ranking_utils", "utils.leaderboard", "check_resumes"]
+IMPORT_BUDGET_SECONDS = 1.0
+
+def import_time(module):
+    """Wall time of a cold import in a fresh interpreter, plus which models it loaded"""
+    code = (
+        "import time; start = time.time(); import " + module + "; elapsed = time.time() - start; "
+        "from utils import model_registry; "
+        "print(elapsed, [n for n, loaded in model_registry.readiness()['models'].items() if loaded])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1:]
+    elapsed, loaded = result.stdout.strip().splitlines()[-1].split(" ", 1)
+    return float(elapsed), loaded
+
+def test_startup_time():
+    """Cold import time of the app and CLI entry points"""
+    print("🧪 Testing Startup Import Time")
+    print("=" * 50)
+    passed = True
+    for module in MODULES:
+        start = time.time()
+        elapsed, loaded = import_time(module)
+        if elapsed is None:
+            print(f"❌ {module}: import failed {loaded}")
+            passed = False
+            continue
+        ok = elapsed < IMPORT_BUDGET_SECONDS and loaded == "[]"
+        passed = passed and ok
+        print(f"{'✅' if ok else '❌'} {module}: {elapsed:.2f}s import ({time.time() - start:.2f}s process) | models loaded: {loaded}")
+    print(f"\n{'✅' if passed else '❌'} Import budget {IMPORT_BUDGET_SECONDS}s")
+    assert passed, f"an entry point exceeded the {IMPORT_BUDGET_SECONDS}s import budget or loaded a model"
+
+if __name__ == "__main__":
+    test_startup_time()
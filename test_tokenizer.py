@@ -0,0 +1,57 @@
+import glob
+import time
+from utils.resume_text_utils import extract_text_from_pdf, clean_text
+from utils.ranking_utils import word_tokenize, extract_key_terms_enhanced, _expand_tokens
+
+def ranking_terms(tokens):
+    """Token-derived terms the ranking uses: expansion candidates (3+ chars)"""
+    return {token for token in tokens if len(token) >= 3}
+
+def best_time(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.time()
+        fn()
+        best = min(best, time.time() - start)
+    return best
+
+def test_tokenizer(pattern="uploads/**/*.pdf"):
+    """Fast regex tokenizer against nltk.word_tokenize: key-term parity and speed on uploaded resumes"""
+    print("🧪 Testing Fast Ranking Tokenizer")
+    print("=" * 50)
+
+    paths = sorted(glob.glob(pattern, recursive=True))
+    texts = [clean_text(extract_text_from_pdf(path)).lower() for path in paths]
+    print(f"📊 {len(texts)} resumes from {pattern}")
+    if not texts:
+        print("❌ No PDFs found")
+        return
+
+    mismatches = 0
+    for path, text in zip(paths, texts):
+        nltk_tokens = word_tokenize(text, tokenizer="nltk")
+        fast_tokens = word_tokenize(text, tokenizer="fast")
+        nltk_terms = set(extract_key_terms_enhanced(text, tokens=nltk_tokens))
+        fast_terms = set(extract_key_terms_enhanced(text, tokens=fast_tokens))
+        same_terms = nltk_terms == fast_terms and ranking_terms(nltk_tokens) == ranking_terms(fast_tokens)
+        same_expansion = _expand_tokens(nltk_tokens, 50) == _expand_tokens(fast_tokens, 50)
+        if not (same_terms and same_expansion):
+            mismatches += 1
+            print(f"⚠️ {path}")
+            print(f"   only nltk: {sorted((nltk_terms - fast_terms) | (ranking_terms(nltk_tokens) - ranking_terms(fast_tokens)))}")
+            print(f"   only fast: {sorted((fast_terms - nltk_terms) | (ranking_terms(fast_tokens) - ranking_terms(nltk_tokens)))}")
+
+    nltk_time = best_time(lambda: [word_tokenize(text, tokenizer="nltk") for text in texts])
+    fast_time = best_time(lambda: [word_tokenize(text, tokenizer="fast") for text in texts])
+
+    print("\n📈 TOKENIZER REPORT:")
+    print("-" * 30)
+    print(f"   Key-term/expansion sets identical: {len(texts) - mismatches}/{len(texts)}")
+    print(f"   nltk: {1000 * nltk_time / len(texts):.2f} ms/doc")
+    print(f"   fast: {1000 * fast_time / len(texts):.2f} ms/doc ({nltk_time / max(fast_time, 1e-9):.1f}x faster)")
+
+    print(f"\n{'✅' if mismatches == 0 else '⚠️'} Tokenizer comparison completed")
+    assert mismatches == 0, f"{mismatches} documents tokenize differently"
+
+if __name__ == "__main__":
+    test_tokenizer()
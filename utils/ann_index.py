@@ -0,0 +1,312 @@
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no cross-process lock, run a single app process there
+    fcntl = None
+
+# On-disk location of the resume index: a compacted base snapshot plus an append-only delta log.
+# The snapshot keeps the compact codes; full-precision vectors live in a separate memory-mapped file.
+INDEX_DIR = os.environ.get("RESUME_INDEX_DIR", "indexes")
+BASE_PATH = os.path.join(INDEX_DIR, "resume_ivf.npz")
+FULL_PATH = os.path.join(INDEX_DIR, "resume_ivf_full.npy")
+DELTA_PATH = os.path.join(INDEX_DIR, "resume_ivf.delta")
+
+# Resume ids are Mongo ObjectId hex strings
+ID_BYTES = 24
+# Below this many vectors search is brute force, above it an IVF-flat index is trained
+TRAIN_THRESHOLD = 1024
+# Compact the delta log into the base snapshot after this many inserts
+COMPACT_EVERY = 500
+DEFAULT_NPROBE = 16
+# In-memory vector format: "int8" (per-vector scale, ~4x smaller) or "float16" (2x smaller)
+ANN_STORAGE = os.environ.get("ANN_STORAGE", "int8")
+# Candidates rescored at full precision per requested result
+RESCORE_FACTOR = 4
+# Rows dequantized at a time when assigning or saving
+BLOCK_SIZE = 8192
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def quantize(vectors, storage=ANN_STORAGE):
+    """Compact codes plus per-vector scale, dequantize with codes * scale"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if storage == "float16":
+        return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.round(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def train_centroids(vectors, nlist, iterations=10, seed=0):
+    """Spherical k-means on unit vectors, returns nlist unit centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for c in range(nlist):
+            members = vectors[assignments == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+        centroids = _normalize(centroids)
+    return centroids
+
+
+class IVFFlatIndex:
+    """Inverted-file index over compact (int8/float16) vectors with full-precision rescoring of the top hits"""
+
+    def __init__(self, dim, storage=ANN_STORAGE):
+        self.dim = dim
+        self.storage = storage
+        self.ids = []
+        self.positions = {}
+        self.codes = np.zeros((0, dim), dtype=np.float16 if storage == "float16" else np.int8)
+        self.scales = np.zeros(0, dtype=np.float32)
+        # Full-precision vectors: memory-mapped snapshot rows plus rows added since (position -> vector)
+        self.base_full = np.zeros((0, dim), dtype=np.float32)
+        self.extra_full = {}
+        self.centroids = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.trained_size = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _dequantize(self, rows):
+        return self.codes[rows].astype(np.float32) * self.scales[rows, None]
+
+    def full_vectors(self, rows):
+        return np.vstack([
+            self.extra_full[r] if r in self.extra_full else self.base_full[r] for r in rows
+        ]).astype(np.float32) if len(rows) else np.zeros((0, self.dim), dtype=np.float32)
+
+    def _assign(self, vectors):
+        if self.centroids is None:
+            return np.full(len(vectors), -1, dtype=np.int32)
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def train(self, sample_size=20000, seed=0):
+        """(Re)build the coarse quantizer over (a sample of) the stored vectors"""
+        if len(self) < TRAIN_THRESHOLD:
+            self.centroids = None
+        else:
+            rng = np.random.default_rng(seed)
+            sample = np.sort(rng.choice(len(self), min(sample_size, len(self)), replace=False))
+            nlist = int(np.sqrt(len(self)))
+            self.centroids = train_centroids(self._dequantize(sample), nlist, seed=seed)
+        self.assignments = np.concatenate([
+            self._assign(self._dequantize(np.arange(start, min(start + BLOCK_SIZE, len(self)))))
+            for start in range(0, len(self), BLOCK_SIZE)
+        ] or [np.zeros(0, dtype=np.int32)])
+        self.trained_size = len(self)
+
+    def add(self, ids, vectors):
+        """Insert or replace vectors by id"""
+        vectors = _normalize(vectors).reshape(-1, self.dim)
+        codes, scales = quantize(vectors, self.storage)
+        new_rows = []
+        for j, resume_id in enumerate(ids):
+            position = self.positions.get(resume_id)
+            if position is not None:
+                self.codes[position] = codes[j]
+                self.scales[position] = scales[j]
+                self.assignments[position] = self._assign(vectors[j:j + 1])[0]
+            else:
+                position = len(self.ids)
+                self.positions[resume_id] = position
+                self.ids.append(resume_id)
+                new_rows.append(j)
+            self.extra_full[position] = vectors[j]
+        if new_rows:
+            self.codes = np.concatenate([self.codes, codes[new_rows]])
+            self.scales = np.concatenate([self.scales, scales[new_rows]])
+            self.assignments = np.concatenate([self.assignments, self._assign(vectors[new_rows])])
+        # Train once the pool is large enough, retrain when it has grown 4x since
+        if (self.centroids is None and len(self) >= TRAIN_THRESHOLD) or len(self) > 4 * max(self.trained_size, TRAIN_THRESHOLD):
+            self.train()
+
+    def search(self, query, k=10, nprobe=DEFAULT_NPROBE, rescore=True):
+        """Top-k (id, cosine score) pairs: approximate scores on compact codes, exact rescoring of the best"""
+        if not self.ids:
+            return []
+        # 1..N results, a non-positive k would break argpartition
+        k = max(1, min(int(k), len(self.ids)))
+        query = _normalize(query).reshape(self.dim)
+        if self.centroids is None:
+            candidates = np.arange(len(self.ids))
+        else:
+            probe = np.argsort(-(self.centroids @ query))[:nprobe]
+            candidates = np.flatnonzero(np.isin(self.assignments, probe))
+        if not len(candidates):
+            return []
+        scores = (self.codes[candidates].astype(np.float32) @ query) * self.scales[candidates]
+
+        shortlist_size = min(k * RESCORE_FACTOR if rescore else k, len(candidates))
+        shortlist = np.argpartition(-scores, shortlist_size - 1)[:shortlist_size]
+        candidates = candidates[shortlist]
+        scores = scores[shortlist]
+        if rescore:
+            scores = self.full_vectors(candidates) @ query
+
+        k = min(k, len(candidates))
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [(self.ids[candidates[i]], float(scores[i])) for i in top]
+
+    def save(self, path, full_path):
+        """Write the compact snapshot and stream full-precision rows into a .npy for memory-mapping"""
+        full = np.lib.format.open_memmap(full_path, mode="w+", dtype=np.float32, shape=(len(self), self.dim))
+        for start in range(0, len(self), BLOCK_SIZE):
+            rows = range(start, min(start + BLOCK_SIZE, len(self)))
+            full[rows.start:rows.stop] = self.full_vectors(rows)
+        full.flush()
+        del full
+        np.savez(
+            path,
+            ids=np.array(self.ids, dtype=f"S{ID_BYTES}"),
+            codes=self.codes,
+            scales=self.scales,
+            centroids=self.centroids if self.centroids is not None else np.zeros((0, self.dim), dtype=np.float32),
+            assignments=self.assignments,
+            trained_size=self.trained_size
+        )
+
+    @classmethod
+    def load(cls, path, full_path):
+        data = np.load(path)
+        storage = "float16" if data["codes"].dtype == np.float16 else "int8"
+        index = cls(data["codes"].shape[1], storage=storage)
+        index.ids = [i.decode("ascii") for i in data["ids"]]
+        index.positions = {resume_id: i for i, resume_id in enumerate(index.ids)}
+        index.codes = data["codes"]
+        index.scales = data["scales"]
+        index.base_full = np.load(full_path, mmap_mode="r")
+        index.centroids = data["centroids"] if len(data["centroids"]) else None
+        index.assignments = data["assignments"]
+        index.trained_size = int(data["trained_size"])
+        return index
+
+    def memory_bytes(self):
+        """Resident bytes of the searchable part (compact codes, scales, assignments)"""
+        return self.codes.nbytes + self.scales.nbytes + self.assignments.nbytes
+
+
+@contextmanager
+def _file_lock(path, exclusive=True):
+    """flock on a lock file next to the delta log, shared by every process using the index"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class PersistentResumeIndex:
+    """IVFFlatIndex backed by a base snapshot plus an append-only delta log shared by all workers"""
+
+    def __init__(self, dim, base_path=BASE_PATH, full_path=FULL_PATH, delta_path=DELTA_PATH):
+        self.dim = dim
+        self.base_path = base_path
+        self.full_path = full_path
+        self.delta_path = delta_path
+        # Appends, compactions and reads of the delta log hold this across processes:
+        # a record appended between another process's last read and its truncate would be lost
+        self.lock_path = delta_path + ".lock"
+        self.record_size = ID_BYTES + 4 * dim
+        self.lock = threading.Lock()
+        self.index = None
+        self.base_mtime = None
+        self.delta_offset = 0
+        self.pending = 0
+
+    def _refresh(self):
+        """Pick up a newer base snapshot and any delta records written by other processes"""
+        base_mtime = os.path.getmtime(self.base_path) if os.path.exists(self.base_path) else None
+        if self.index is None or base_mtime != self.base_mtime:
+            self.index = IVFFlatIndex.load(self.base_path, self.full_path) if base_mtime else IVFFlatIndex(self.dim)
+            self.base_mtime = base_mtime
+            self.delta_offset = 0
+        if not os.path.exists(self.delta_path):
+            return
+        with open(self.delta_path, "rb") as f:
+            f.seek(self.delta_offset)
+            data = f.read()
+        count = len(data) // self.record_size
+        if count:
+            records = np.frombuffer(data[:count * self.record_size], dtype=np.uint8).reshape(count, self.record_size)
+            ids = [bytes(r[:ID_BYTES]).decode("ascii") for r in records]
+            vectors = records[:, ID_BYTES:].copy().view(np.float32)
+            self.index.add(ids, vectors)
+            self.delta_offset += count * self.record_size
+
+    def add(self, resume_id, vector):
+        """Insert one resume vector and append it to the delta log"""
+        resume_id = str(resume_id)
+        vector = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        with self.lock, _file_lock(self.lock_path):
+            os.makedirs(os.path.dirname(self.delta_path) or ".", exist_ok=True)
+            self._refresh()
+            with open(self.delta_path, "ab") as f:
+                f.write(resume_id.encode("ascii").ljust(ID_BYTES)[:ID_BYTES] + vector.tobytes())
+            # Replays our record along with anything other workers appended meanwhile
+            self._refresh()
+            self.pending += 1
+            if self.pending >= COMPACT_EVERY:
+                self._compact()
+
+    def _compact(self):
+        # Positions are stable, so replacing the full-precision file first keeps older snapshots valid
+        tmp_full_path = self.full_path + ".tmp.npy"
+        tmp_path = self.base_path + ".tmp.npz"
+        self.index.save(tmp_path, tmp_full_path)
+        os.replace(tmp_full_path, self.full_path)
+        os.replace(tmp_path, self.base_path)
+        open(self.delta_path, "wb").close()
+        # Reload so full-precision rows come from the memory-mapped file, not RAM
+        self.index = IVFFlatIndex.load(self.base_path, self.full_path)
+        self.base_mtime = os.path.getmtime(self.base_path)
+        self.delta_offset = 0
+        self.pending = 0
+
+    def rebuild(self, ids, vectors):
+        """Replace the whole index, e.g. after a model change"""
+        with self.lock, _file_lock(self.lock_path):
+            os.makedirs(os.path.dirname(self.base_path) or ".", exist_ok=True)
+            self.index = IVFFlatIndex(self.dim)
+            if len(ids):
+                self.index.add([str(i) for i in ids], vectors)
+                self.index.train()
+            self._compact()
+
+    def search(self, query, k=10, nprobe=DEFAULT_NPROBE):
+        with self.lock:
+            with _file_lock(self.lock_path, exclusive=False):
+                self._refresh()
+            return self.index.search(query, k=k, nprobe=nprobe)
+
+
+_resume_index = None
+_resume_index_lock = threading.Lock()
+
+
+def get_resume_index(dim=384):
+    """Process-wide resume index (all-MiniLM-L6-v2 vectors are 384-d)"""
+    global _resume_index
+    with _resume_index_lock:
+        if _resume_index is None:
+            _resume_index = PersistentResumeIndex(dim)
+    return _resume_index
@@ -0,0 +1,246 @@
+import io
+import os
+import json
+import time
+import zipfile
+import multiprocessing
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from bson import ObjectId
+from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
+
+# Parser processes, each loads the NER model once
+INGEST_WORKERS = int(os.environ.get("INGEST_WORKERS", str(os.cpu_count() or 2)))
+# Applications per insert_many, also the checkpoint granularity
+INGEST_BATCH_SIZE = int(os.environ.get("INGEST_BATCH_SIZE", "100"))
+# Seconds between two throughput lines
+REPORT_EVERY = 5
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017")
+db = client["resume_ranking_db"]
+resume_collection = db["form_extractions"]
+jd_collection = db["jd_extractions"]
+
+# Per-worker state set by _init_ingest_worker
+_source = None
+_zip = None
+
+
+def list_resumes(source):
+    """PDF names in a directory (recursive, relative paths) or a zip archive, in a stable order"""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = [
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and info.filename.lower().endswith(".pdf")
+                and not info.filename.startswith("__MACOSX/")
+            ]
+        return sorted(names)
+    names = []
+    for root, _, files in os.walk(source):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                names.append(os.path.relpath(os.path.join(root, name), source))
+    return sorted(names)
+
+
+def checkpoint_path(source, jd_id):
+    """Checkpoint next to the source: resumes/ + JD 64ab... -> resumes.ingest-64ab....jsonl"""
+    return f"{os.path.normpath(source)}.ingest-{jd_id}.jsonl"
+
+
+def load_checkpoint(path):
+    """Names already inserted (or skipped as duplicates) by an earlier run, failed files are retried"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Last line of a run killed mid-write
+                continue
+            if entry.get("status") in ("inserted", "duplicate"):
+                done.add(entry["name"])
+    return done
+
+
+def _init_ingest_worker(source):
+    """Open the source and load the extraction models once per worker process"""
+    global _source, _zip
+    from utils import model_registry
+
+    _source = source
+    if zipfile.is_zipfile(source):
+        _zip = zipfile.ZipFile(source)
+    model_registry.get("ner")
+
+
+def _read_resume(name):
+    if _zip is not None:
+        return _zip.read(name)
+    with open(os.path.join(_source, name), "rb") as f:
+        return f.read()
+
+
+def _ingest_file(name, jd_id):
+    """Worker: store and parse one PDF, returns (name, application or None, error or None)"""
+    from utils.upload_store import accept_upload, flush_upload, upload_path
+
+    try:
+        sha256, parsed_data = accept_upload(io.BytesIO(_read_resume(name)), os.path.basename(name))
+        # The process must not move on before the file is on disk
+        flush_upload(sha256)
+    except Exception as e:
+        return name, None, str(e)
+    application = {
+        **parsed_data,
+        "resume_filepath": upload_path(sha256),
+        "jd_id": jd_id
+    }
+    return name, application, None
+
+
+class _Progress:
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.start = time.time()
+        self.last_report = self.start
+
+    def rate(self):
+        return self.done / max(time.time() - self.start, 1e-9)
+
+    def report(self, force=False):
+        now = time.time()
+        if not force and now - self.last_report < REPORT_EVERY:
+            return
+        self.last_report = now
+        print(
+            f"📈 {self.done}/{self.total} files, {self.rate():.1f} files/s "
+            f"({self.inserted} inserted, {self.duplicates} duplicates, {self.failed} failed)"
+        )
+
+
+def _flush_batch(batch, jd_id, checkpoint, progress, index):
+    """insert_many one batch, then checkpoint exactly the names that reached the database"""
+    from utils.upload_store import add_references
+
+    # An application for the same file and JD may exist from a run killed before its checkpoint write
+    existing = set(resume_collection.distinct("resume_sha256", {
+        "jd_id": jd_id, "resume_sha256": {"$in": [application["resume_sha256"] for _, application in batch]}
+    }))
+    entries, pending, seen = [], [], set()
+    for name, application in batch:
+        sha256 = application["resume_sha256"]
+        if sha256 in existing or sha256 in seen:
+            entries.append({"name": name, "status": "duplicate", "resume_sha256": sha256})
+            progress.duplicates += 1
+            continue
+        seen.add(sha256)
+        application["submitted_at"] = datetime.now(timezone.utc)
+        pending.append((name, application))
+
+    failed_rows = {}
+    if pending:
+        documents = [application for _, application in pending]
+        try:
+            resume_collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failed_rows = {error["index"]: error.get("errmsg", "insert failed") for error in e.details["writeErrors"]}
+        inserted = [application for i, (_, application) in enumerate(pending) if i not in failed_rows]
+        for i, (name, application) in enumerate(pending):
+            if i in failed_rows:
+                entries.append({"name": name, "status": "failed", "error": failed_rows[i]})
+            else:
+                entries.append({"name": name, "status": "inserted", "resume_id": str(application["_id"])})
+        progress.inserted += len(inserted)
+        progress.failed += len(failed_rows)
+
+        add_references(application["resume_sha256"] for application in inserted)
+        if index and inserted:
+            from utils.candidate_search import index_resumes
+            try:
+                index_resumes([application["_id"] for application in inserted], inserted)
+            except Exception as e:
+                print("⚠️ Could not index resume embeddings:", e)
+
+    for entry in entries:
+        checkpoint.write(json.dumps(entry) + "\n")
+    checkpoint.flush()
+    os.fsync(checkpoint.fileno())
+
+
+def ingest(source, jd_id, workers=INGEST_WORKERS, batch_size=INGEST_BATCH_SIZE, checkpoint=None, index=True,
+           score=True):
+    """Parse every PDF of a directory or zip in a process pool and insert them as applications to a JD.
+
+    With score=True the new applications are then scored by a background rank job, so the first
+    ranking page view does not have to. Returns the run's counters and the job id.
+    """
+    jd_id = ObjectId(jd_id)
+    if not jd_collection.find_one({"_id": jd_id}, {"_id": 1}):
+        raise ValueError(f"JD {jd_id} not found")
+
+    checkpoint = checkpoint or checkpoint_path(source, jd_id)
+    done = load_checkpoint(checkpoint)
+    names = [name for name in list_resumes(source) if name not in done]
+    print(f"📂 {len(names)} PDFs to ingest from {source} ({len(done)} already done per {checkpoint})")
+
+    progress = _Progress(len(names))
+    batch = []
+    with open(checkpoint, "a", encoding="utf-8") as checkpoint_file, ProcessPoolExecutor(
+        max_workers=workers,
+        # spawn: MongoClient and torch are not fork-safe
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_ingest_worker,
+        initargs=(source,)
+    ) as pool:
+        remaining = iter(names)
+        running = set()
+        while True:
+            # Bounded in-flight work keeps memory flat on very large drives
+            while len(running) < workers * 4:
+                name = next(remaining, None)
+                if name is None:
+                    break
+                running.add(pool.submit(_ingest_file, name, jd_id))
+            if not running:
+                break
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, application, error = future.result()
+                progress.done += 1
+                if error:
+                    progress.failed += 1
+                    print(f"❌ {name}: {error}")
+                    checkpoint_file.write(json.dumps({"name": name, "status": "failed", "error": error}) + "\n")
+                    continue
+                batch.append((name, application))
+            if len(batch) >= batch_size:
+                _flush_batch(batch, jd_id, checkpoint_file, progress, index)
+                batch = []
+            progress.report()
+        if batch:
+            _flush_batch(batch, jd_id, checkpoint_file, progress, index)
+
+    progress.report(force=True)
+    rank_job_id = None
+    if score:
+        from utils.rank_jobs import submit_rank_job
+        rank_job_id = submit_rank_job(jd_id)
+    return {
+        "total": progress.total,
+        "inserted": progress.inserted,
+        "duplicates": progress.duplicates,
+        "failed": progress.failed,
+        "seconds": round(time.time() - progress.start, 1),
+        "files_per_second": round(progress.rate(), 2),
+        "rank_job_id": rank_job_id
+    }
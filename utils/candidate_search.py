@@ -0,0 +1,55 @@
+from utils.ann_index import get_resume_index
+from utils.resume_document import resume_text
+
+
+def index_resume(resume_id, resume):
+    """Embed a stored resume once and insert it into the pool-wide ANN index"""
+    from utils.ranking_utils import get_embeddings
+
+    text = resume_text(resume)
+    if not text:
+        return
+    vector = get_embeddings([text])[0]
+    get_resume_index(dim=vector.shape[0]).add(resume_id, vector)
+
+
+def index_resumes(resume_ids, resumes):
+    """index_resume for a batch, encoding all texts in one get_embeddings call"""
+    from utils.ranking_utils import get_embeddings
+
+    ids, texts = [], []
+    for resume_id, resume in zip(resume_ids, resumes):
+        text = resume_text(resume)
+        if text:
+            ids.append(resume_id)
+            texts.append(text)
+    if not texts:
+        return 0
+    vectors = get_embeddings(texts)
+    index = get_resume_index(dim=vectors.shape[1])
+    for resume_id, vector in zip(ids, vectors):
+        index.add(resume_id, vector)
+    return len(ids)
+
+
+def search_candidates(jd_text, k=20):
+    """Top-k (resume_id, cosine score) over every resume in the database"""
+    from utils.ranking_utils import get_embeddings
+
+    vector = get_embeddings([jd_text])[0]
+    return get_resume_index(dim=vector.shape[0]).search(vector, k=k)
+
+
+def rebuild_resume_index(collection):
+    """Rebuild the ANN index from every stored resume, e.g. after an embedding model change"""
+    from utils.ranking_utils import get_embeddings
+
+    ids, texts = [], []
+    for resume in collection.find({}, {"resume_filepath": 1, "resume_sha256": 1}):
+        text = resume_text(resume)
+        if text:
+            ids.append(str(resume["_id"]))
+            texts.append(text)
+    vectors = get_embeddings(texts) if texts else None
+    get_resume_index().rebuild(ids, vectors)
+    return len(ids)
@@ -0,0 +1,48 @@
+import re
+import numpy as np
+
+# ~120 words stays under MiniLM's 256 word-piece limit for typical resume text
+CHUNK_WORDS = 120
+# Upper bound on vectors per document, long resumes cost a fixed number of embeddings
+MAX_CHUNKS = 16
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?•|])\s+')
+
+
+def split_into_chunks(text, max_words=CHUNK_WORDS, max_chunks=MAX_CHUNKS):
+    """Pack consecutive sentences into chunks of at most max_words words (always at least one chunk)"""
+    chunks, current = [], []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        words = sentence.split()
+        # Over-long "sentences" (bullet lists flattened by clean_text) are cut by word count
+        while words:
+            room = max_words - len(current)
+            current.extend(words[:room])
+            words = words[room:]
+            if len(current) >= max_words:
+                chunks.append(' '.join(current))
+                current = []
+    if current:
+        chunks.append(' '.join(current))
+    if len(chunks) > max_chunks:
+        # Merge the tail so nothing is dropped, the last chunk is then truncated by the model
+        chunks = chunks[:max_chunks - 1] + [' '.join(chunks[max_chunks - 1:])]
+    return chunks or [text]
+
+
+def aggregate_chunk_similarities(jd_vectors, resume_vectors, chunk_counts, mode="max_mean"):
+    """Score many chunked resumes against a chunked JD with one similarity matrix
+
+    max_mean: for every JD chunk take its best-matching resume chunk, then average
+    (how much of the JD the resume covers). max: single best chunk pair.
+    """
+    def normalize(vectors):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    similarity = normalize(jd_vectors) @ normalize(resume_vectors).T
+    offsets = np.concatenate([[0], np.cumsum(chunk_counts)[:-1]]).astype(np.intp)
+    best = np.maximum.reduceat(similarity, offsets, axis=1)
+    if mode == "max":
+        return best.max(axis=0)
+    return best.mean(axis=0)
@@ -0,0 +1,61 @@
+import hashlib
+import numpy as np
+from utils.inference_backend import INFERENCE_BACKEND
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import PyMongoError
+
+# Embedding model identity. Bump MODEL_VERSION whenever the model weights or the
+# text preprocessing change so that stale vectors are never read back.
+MODEL_NAME = "all-MiniLM-L6-v2"
+# Quantized ONNX vectors differ slightly from PyTorch ones, so each backend gets its own version.
+MODEL_VERSION = "1" if INFERENCE_BACKEND == "torch" else f"1-{INFERENCE_BACKEND}-int8"
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017")
+db = client["resume_ranking_db"]
+embedding_collection = db["embeddings"]
+
+
+def embedding_key(text, model_name=MODEL_NAME, model_version=MODEL_VERSION):
+    """Content-addressed key: hash of the cleaned text plus model name and version"""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model_name}:{model_version}:{digest}"
+
+
+def load_embeddings(texts):
+    """Read cached embeddings for the given texts, returns {text: vector} for the hits only"""
+    keys = {embedding_key(text): text for text in texts}
+    if not keys:
+        return {}
+    try:
+        docs = embedding_collection.find({"_id": {"$in": list(keys)}})
+        return {
+            keys[doc["_id"]]: np.frombuffer(doc["vector"], dtype=np.float32)
+            for doc in docs
+        }
+    except PyMongoError as e:
+        print("⚠️ Embedding store read failed:", e)
+        return {}
+
+
+def save_embeddings(texts, vectors):
+    """Persist one embedding per text, keyed by content hash"""
+    operations = []
+    for text, vector in zip(texts, vectors):
+        vector = np.asarray(vector, dtype=np.float32)
+        operations.append(UpdateOne(
+            {"_id": embedding_key(text)},
+            {"$set": {
+                "model_name": MODEL_NAME,
+                "model_version": MODEL_VERSION,
+                "dim": int(vector.shape[0]),
+                "vector": vector.tobytes()
+            }},
+            upsert=True
+        ))
+    if not operations:
+        return
+    try:
+        embedding_collection.bulk_write(operations, ordered=False)
+    except PyMongoError as e:
+        print("⚠️ Embedding store write failed:", e)
@@ -1,7 +1,18 @@
 import re
 import fitz  # PyMuPDF
 
-def extract_links(text, pdf_path=None):
+def embedded_uris(pdf_path):
+    """Link targets embedded in a PDF's pages"""
+    uris = []
+    try:
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                uris.extend(link["uri"] for link in page.get_links() if "uri" in link)
+    except Exception as e:
+        print("Error reading embedded links:", e)
+    return uris
+
+def extract_links(text, pdf_path=None, uris=None):
     linkedin = ""
     website = ""
     social = []
@@ -88,28 +99,22 @@ def extract_links(text, pdf_path=None):
                 website = website_url
                 break
 
-    # 5. Extract embedded links from PDF (if file path is provided)
-    if pdf_path:
-        try:
-            with fitz.open(pdf_path) as doc:
-                for page in doc:
-                    for link in page.get_links():
-                        if "uri" in link:
-                            uri = link["uri"]
-                            if uri.startswith("http"):
-                                if "linkedin.com" in uri and not linkedin:
-                                    linkedin = uri
-                                elif "github.com" in uri and not website:
-                                    website = uri
-                                elif any(domain in uri for domain in [
-                                    "portfolio", "notion.so", "behance.net", "dribbble.com"
-                                ]) and not website:
-                                    website = uri
-                                elif any(s in uri for s in ["twitter", "facebook", "instagram", "youtube", "medium"]):
-                                    if uri not in social:
-                                        social.append(uri)
-        except Exception as e:
-            print("Error reading embedded links:", e)
+    # 5. Embedded links: already extracted (ResumeDocument.uris) or read from the PDF
+    if uris is None and pdf_path:
+        uris = embedded_uris(pdf_path)
+    for uri in uris or []:
+        if uri.startswith("http"):
+            if "linkedin.com" in uri and not linkedin:
+                linkedin = uri
+            elif "github.com" in uri and not website:
+                website = uri
+            elif any(domain in uri for domain in [
+                "portfolio", "notion.so", "behance.net", "dribbble.com"
+            ]) and not website:
+                website = uri
+            elif any(s in uri for s in ["twitter", "facebook", "instagram", "youtube", "medium"]):
+                if uri not in social:
+                    social.append(uri)
 
     # 6. Clean up URLs
     def clean_url(url):
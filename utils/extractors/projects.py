@@ -1,11 +1,7 @@
 import re
-from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
+from utils import model_registry
 
-# Load NER model
-model_name = "dslim/bert-base-NER"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModelForTokenClassification.from_pretrained(model_name)
-ner_pipeline = pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple")
+# NER model (dslim/bert-base-NER, PyTorch or int8 ONNX per INFERENCE_BACKEND) is loaded on first use
 
 # Extensive cross-domain tech keywords
 TECH_KEYWORDS = [
@@ -125,7 +121,7 @@ def extract_projects(text):
             proj['title'] = first_sent
         else:
             # Fallback NER title
-            entities = ner_pipeline(seg)
+            entities = model_registry.get("ner")(seg)
             for ent in entities:
                 if ent['entity_group'].lower() in ['misc', 'prod', 'org'] and len(ent['word']) > 6:
                     proj['title'] = ent['word'].strip()
@@ -0,0 +1,118 @@
+import os
+import numpy as np
+
+# "torch" (default) or "onnx": ONNX Runtime with dynamically int8-quantized exports
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "torch")
+ONNX_MODEL_DIR = os.environ.get("ONNX_MODEL_DIR", "models/onnx")
+# Intra-op threads per ONNX Runtime session, 0 keeps the onnxruntime default (all cores)
+ONNX_THREADS = int(os.environ.get("ONNX_THREADS", "0"))
+
+SENTENCE_MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+NER_MODEL_ID = "dslim/bert-base-NER"
+QUANTIZED_FILE_NAME = "model_quantized.onnx"
+
+_ORT_MODEL_CLASSES = {
+    "feature-extraction": "ORTModelForFeatureExtraction",
+    "token-classification": "ORTModelForTokenClassification"
+}
+
+
+def onnx_model_path(model_id):
+    return os.path.join(ONNX_MODEL_DIR, model_id.replace("/", "__"))
+
+
+def hub_model_id(model_name):
+    # SentenceTransformer accepts bare names, the Hugging Face exporters need the full id
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+
+def export_quantized(model_id, task):
+    """Export a Hugging Face model to ONNX and quantize its weights to int8 (dynamic quantization)"""
+    import optimum.onnxruntime as ort
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    path = onnx_model_path(model_id)
+    export_dir = path + ".fp32"
+    model = getattr(ort, _ORT_MODEL_CLASSES[task]).from_pretrained(model_id, export=True)
+    model.save_pretrained(export_dir)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(path)
+
+    quantizer = ort.ORTQuantizer.from_pretrained(export_dir)
+    quantizer.quantize(
+        save_dir=path,
+        quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    )
+    return path
+
+
+def _load_quantized(model_id, task):
+    import onnxruntime
+    import optimum.onnxruntime as ort
+
+    path = onnx_model_path(model_id)
+    if not os.path.exists(os.path.join(path, QUANTIZED_FILE_NAME)):
+        print(f"🔄 Exporting int8 ONNX model for {model_id} to {path}")
+        export_quantized(model_id, task)
+    options = onnxruntime.SessionOptions()
+    if ONNX_THREADS:
+        options.intra_op_num_threads = ONNX_THREADS
+    return getattr(ort, _ORT_MODEL_CLASSES[task]).from_pretrained(
+        path, file_name=QUANTIZED_FILE_NAME, session_options=options
+    )
+
+
+class OnnxSentenceEncoder:
+    """Drop-in for SentenceTransformer.encode: mean pooling + L2 normalisation, as all-MiniLM-L6-v2 does"""
+
+    def __init__(self, model_name, max_length=256):
+        from transformers import AutoTokenizer
+
+        model_id = hub_model_id(model_name)
+        self.model = _load_quantized(model_id, "feature-extraction")
+        self.tokenizer = AutoTokenizer.from_pretrained(onnx_model_path(model_id))
+        self.max_length = max_length
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        vectors = [None] * len(texts)
+        # Length-sorted batches keep padding (and wasted compute) small
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            batch_ids = order[start:start + batch_size]
+            inputs = self.tokenizer(
+                [texts[i] for i in batch_ids], padding=True, truncation=True,
+                max_length=self.max_length, return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            for i, vector in zip(batch_ids, pooled.astype(np.float32)):
+                vectors[i] = vector
+        vectors = np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+def get_sentence_encoder(model_name, backend=None):
+    """Sentence embedding model for the configured backend, both expose encode()"""
+    backend = backend or INFERENCE_BACKEND
+    if backend == "onnx":
+        return OnnxSentenceEncoder(model_name)
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def get_ner_pipeline(model_id=NER_MODEL_ID, backend=None):
+    """Token-classification pipeline with simple aggregation for the configured backend"""
+    from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
+
+    backend = backend or INFERENCE_BACKEND
+    if backend == "onnx":
+        model = _load_quantized(model_id, "token-classification")
+        tokenizer = AutoTokenizer.from_pretrained(onnx_model_path(model_id))
+    else:
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        model = AutoModelForTokenClassification.from_pretrained(model_id)
+    return pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple")
@@ -0,0 +1,293 @@
+import os
+import json
+import hashlib
+import datetime
+from functools import lru_cache
+from pymongo import MongoClient, ASCENDING, DESCENDING, UpdateOne
+from utils.resume_document import open_document, resume_text
+import numpy as np
+from utils.ranking_utils import (
+    AnalyzedDocument, rank_resumes_bulk, reweight_scores, scale_scores, scale_components, scoring_config,
+    reasoning_from_scores, find_matching_highlights_enhanced
+)
+from utils.tfidf_index import refit_tfidf_similarities
+
+# Bump when the leaderboard's own scoring code changes
+LEADERBOARD_VERSION = 4
+# Every leaderboard is rebuilt on its next read when this changes: the model, tokenizer, expansion,
+# TF-IDF and chunking versions, weights and scaling all come from scoring_config()
+SCORING_VERSION = f"{LEADERBOARD_VERSION}:" + hashlib.sha256(
+    json.dumps(scoring_config(), sort_keys=True).encode("utf-8")
+).hexdigest()[:16]
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017")
+db = client["resume_ranking_db"]
+resume_collection = db["form_extractions"]
+leaderboard_collection = db["jd_leaderboards"]
+
+_indexes_ready = False
+
+
+def _ensure_indexes():
+    global _indexes_ready
+    if not _indexes_ready:
+        leaderboard_collection.create_index([("jd_id", ASCENDING), ("score", DESCENDING)])
+        leaderboard_collection.create_index([("jd_id", ASCENDING), ("resume_id", ASCENDING)], unique=True)
+        _indexes_ready = True
+
+
+def jd_pdf_path(jd_id):
+    return f"pdfs/JD_{jd_id}_internal.pdf"
+
+
+def load_jd_text(jd_id):
+    path = jd_pdf_path(jd_id)
+    if not os.path.exists(path):
+        return None
+    return open_document(path).cleaned_text
+
+
+def _text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_resume_texts(resumes):
+    """Cleaned text of each resume with a stored parse or an existing file, returns (resumes, texts)"""
+    kept, texts = [], []
+    for resume in resumes:
+        text = resume_text(resume)
+        if not text:
+            continue
+        kept.append(resume)
+        texts.append(text)
+    return kept, texts
+
+
+def score_resumes(jd_id, jd_text, resumes):
+    """Score resumes against a JD and upsert them into its leaderboard"""
+    _ensure_indexes()
+    scored, texts = load_resume_texts(resumes)
+    scored_ids = {resume["_id"] for resume in scored}
+    _mark_unscorable(jd_id, jd_text, [resume for resume in resumes if resume["_id"] not in scored_ids])
+    if not scored:
+        return 0
+
+    # Highlights are generated later, only for the entries that get displayed
+    ranking = rank_resumes_bulk(jd_text, texts, with_highlights=False)
+    jd_hash = _text_hash(jd_text)
+    now = datetime.datetime.utcnow()
+    operations = []
+    for i, resume in enumerate(scored):
+        entry = {
+            "jd_id": jd_id,
+            "resume_id": resume["_id"],
+            "name": resume.get("personal_details", {}).get("name", "Unnamed"),
+            "email": resume.get("personal_details", {}).get("email", ""),
+            "filepath": resume.get("resume_filepath"),
+            "resume_sha256": resume.get("resume_sha256"),
+            "score": float(ranking["scores"][i]),
+            "detailed_scores": {
+                "semantic": float(ranking["semantic"][i]),
+                "tfidf": float(ranking["tfidf"][i]),
+                "term_overlap": float(ranking["term_overlap"][i])
+            },
+            # Unweighted, unscaled components: re-weighting never needs the texts again
+            "raw_scores": {
+                "semantic": float(ranking["raw_semantic"][i]),
+                "tfidf": float(ranking["raw_tfidf"][i]),
+                "term_overlap": float(ranking["raw_term_overlap"][i])
+            },
+            "reasoning": ranking["reasoning"][i],
+            "highlights": None,
+            "common_terms": ranking["common_terms"][i],
+            # TF-IDF depends on the whole applicant pool: this batch's value is provisional until refresh_tfidf
+            "expanded_text": ranking["expanded"][i],
+            "tfidf_fresh": False,
+            "jd_hash": jd_hash,
+            "scoring_version": SCORING_VERSION,
+            "scored_at": now
+        }
+        operations.append(UpdateOne(
+            {"jd_id": jd_id, "resume_id": resume["_id"]}, {"$set": entry}, upsert=True
+        ))
+    leaderboard_collection.bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+def _mark_unscorable(jd_id, jd_text, resumes):
+    # A file gone and never parsed has no text: recorded once so it does not stay pending
+    # (and trigger a rank job on every page view), retried when the leaderboard is rebuilt
+    if not resumes:
+        return
+    marker = {
+        "jd_id": jd_id,
+        "unscorable": True,
+        "tfidf_fresh": True,
+        "jd_hash": _text_hash(jd_text),
+        "scoring_version": SCORING_VERSION,
+        "scored_at": datetime.datetime.utcnow()
+    }
+    leaderboard_collection.bulk_write([
+        UpdateOne(
+            {"jd_id": jd_id, "resume_id": resume["_id"]}, {"$set": {**marker, "resume_id": resume["_id"]}}, upsert=True
+        )
+        for resume in resumes
+    ], ordered=False)
+
+
+def add_application(resume_id, data):
+    """Score a newly saved application once and insert it into its JD leaderboard.
+
+    Runs on the background indexer, which also refits the JD's TF-IDF column for the grown pool.
+    """
+    jd_id = data.get("jd_id")
+    if not jd_id:
+        return
+    jd_text = load_jd_text(jd_id)
+    if not jd_text:
+        return
+    score_resumes(jd_id, jd_text, [{**data, "_id": resume_id}])
+    refresh_tfidf(jd_id, jd_text)
+
+
+def rebuild_leaderboard(jd_id, jd_text):
+    """Rescore every applicant of a JD, needed only when the JD or the scoring model changes"""
+    _ensure_indexes()
+    leaderboard_collection.delete_many({"jd_id": jd_id})
+    return score_resumes(jd_id, jd_text, list(resume_collection.find({"jd_id": jd_id})))
+
+
+def pending_applications(jd_id, jd_text):
+    """Applications that still need scoring, clearing the leaderboard if the JD or model changed.
+
+    Entries of applications deleted since they were scored are dropped here too.
+    """
+    _ensure_indexes()
+    jd_hash = _text_hash(jd_text)
+    stale = leaderboard_collection.find_one({
+        "jd_id": jd_id,
+        "$or": [{"jd_hash": {"$ne": jd_hash}}, {"scoring_version": {"$ne": SCORING_VERSION}}]
+    })
+    if stale:
+        print(f"🔄 Rebuilding leaderboard for JD {jd_id}")
+        leaderboard_collection.delete_many({"jd_id": jd_id})
+        return list(resume_collection.find({"jd_id": jd_id}))
+    ranked_ids = set(leaderboard_collection.distinct("resume_id", {"jd_id": jd_id}))
+    application_ids = resume_collection.distinct("_id", {"jd_id": jd_id})
+    deleted_ids = ranked_ids.difference(application_ids)
+    if deleted_ids:
+        leaderboard_collection.delete_many({"jd_id": jd_id, "resume_id": {"$in": list(deleted_ids)}})
+        # The TF-IDF pool shrank, the remaining entries are refit on the next refresh
+        leaderboard_collection.update_many({"jd_id": jd_id}, {"$set": {"tfidf_fresh": False}})
+    # Catch up on applications saved before the leaderboard existed or whose scoring failed
+    missing_ids = [i for i in application_ids if i not in ranked_ids]
+    if not missing_ids:
+        return []
+    return list(resume_collection.find({"_id": {"$in": missing_ids}}))
+
+
+def refresh_tfidf(jd_id, jd_text):
+    """Recompute every applicant's TF-IDF component under one fit on the JD's current applicant pool.
+
+    Runs only when an application was scored since the last refresh; the scores, display
+    components and reasoning of the entries are updated from their stored raw scores.
+    """
+    scored = {"jd_id": jd_id, "unscorable": {"$ne": True}}
+    if not leaderboard_collection.find_one({**scored, "tfidf_fresh": {"$ne": True}}, {"_id": 1}):
+        return 0
+    entries = list(leaderboard_collection.find(scored, {
+        "expanded_text": 1, "raw_scores": 1, "detailed_scores": 1, "common_terms": 1, "scored_at": 1
+    }))
+    raw_tfidf = refit_tfidf_similarities(
+        _analyzed_jd(jd_text).expanded, [entry.get("expanded_text", "") for entry in entries]
+    )
+    raw_semantic = np.array([entry["raw_scores"]["semantic"] for entry in entries])
+    raw_overlap = np.array([entry["raw_scores"]["term_overlap"] for entry in entries])
+    scores = reweight_scores(raw_semantic, raw_tfidf, raw_overlap)
+    tfidf = scale_scores(raw_tfidf)
+
+    operations = []
+    for i, entry in enumerate(entries):
+        detailed = {**entry["detailed_scores"], "tfidf": float(tfidf[i])}
+        operations.append(UpdateOne(
+            # An entry rescored meanwhile keeps its new values and stays marked for the next refresh
+            {"_id": entry["_id"], "scored_at": entry["scored_at"]},
+            {"$set": {
+                "score": float(scores[i]),
+                "detailed_scores": detailed,
+                "raw_scores.tfidf": float(raw_tfidf[i]),
+                "reasoning": reasoning_from_scores(
+                    float(scores[i]), detailed["semantic"], detailed["tfidf"], detailed["term_overlap"],
+                    entry.get("common_terms", [])
+                ),
+                "tfidf_fresh": True
+            }}
+        ))
+    leaderboard_collection.bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+def read_leaderboard(jd_id):
+    """Leaderboard entries for a JD, best score first"""
+    return list(leaderboard_collection.find(
+        {"jd_id": jd_id, "unscorable": {"$ne": True}}, {"expanded_text": 0}
+    ).sort("score", DESCENDING))
+
+
+def get_leaderboard(jd_id, jd_text, pending=None):
+    """Sorted leaderboard entries for a JD, scoring only applications that are not on it yet
+    (pending, when the caller already looked them up).
+
+    The O(N) TF-IDF refit is left to the background indexer and rank jobs, a page view only
+    reads; entries scored here keep their provisional TF-IDF until the next refresh.
+    """
+    if pending is None:
+        pending = pending_applications(jd_id, jd_text)
+    if pending:
+        score_resumes(jd_id, jd_text, pending)
+    return read_leaderboard(jd_id)
+
+
+def reweight_leaderboard(entries, weights=None, scaling=None):
+    """Entries re-scored from their stored raw components and re-sorted, best first.
+
+    The reasoning is regenerated for the new score; its component numbers keep their display
+    scaling, the requested scaling only applies to the final score.
+    """
+    if not entries:
+        return []
+    raw = np.array([
+        [entry["raw_scores"][c] for c in ("semantic", "tfidf", "term_overlap")] for entry in entries
+    ])
+    scores = reweight_scores(raw[:, 0], raw[:, 1], raw[:, 2], weights=weights, scaling=scaling)
+    components = np.column_stack(scale_components(raw[:, 0], raw[:, 1], raw[:, 2]))
+    order = np.argsort(-scores, kind="stable")
+    return [{
+        **entries[i],
+        "score": float(scores[i]),
+        "reasoning": reasoning_from_scores(
+            float(scores[i]), *(float(c) for c in components[i]), entries[i].get("common_terms", [])
+        )
+    } for i in order]
+
+
+@lru_cache(maxsize=32)
+def _analyzed_jd(jd_text):
+    # The JD's sentences and term index are built once and shared by every page view
+    return AnalyzedDocument(jd_text)
+
+
+def attach_highlights(jd_text, entries):
+    """Fill in highlights for the given (displayed) entries, computing and storing only missing ones"""
+    missing = [entry for entry in entries if entry.get("highlights") is None]
+    if not missing:
+        return entries
+    jd_doc = _analyzed_jd(jd_text)
+    operations = []
+    for entry in missing:
+        text = resume_text(entry)
+        entry["highlights"] = find_matching_highlights_enhanced(jd_doc, text) if text else []
+        operations.append(UpdateOne({"_id": entry["_id"]}, {"$set": {"highlights": entry["highlights"]}}))
+    leaderboard_collection.bulk_write(operations, ordered=False)
+    return entries
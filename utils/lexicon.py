@@ -0,0 +1,80 @@
+import os
+import pickle
+import threading
+from functools import lru_cache
+from utils import model_registry
+
+# Precompiled synonym table, built offline by build_lexicon.py
+LEXICON_PATH = os.environ.get("SYNONYM_LEXICON_PATH", "data/synonym_lexicon.pkl")
+LEXICON_FORMAT_VERSION = 2
+# Expansion only ever uses the first few synonyms of a word, so only those are stored
+SYNONYMS_PER_WORD = 3
+# Bounded cache for words missing from the compiled table (inflections, typos, new terms)
+FALLBACK_CACHE_SIZE = 50000
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+
+def wordnet_synonyms(word):
+    """Live WordNet lookup, synonyms in synset order (most common sense first)"""
+    model_registry.get("nltk_data")
+    from nltk.corpus import wordnet
+
+    synonyms = {}
+    for syn in wordnet.synsets(word):
+        for lemma in syn.lemmas():
+            synonyms.setdefault(lemma.name(), None)
+    return tuple(synonyms)
+
+
+@lru_cache(maxsize=FALLBACK_CACHE_SIZE)
+def _cached_wordnet_synonyms(word):
+    return wordnet_synonyms(word)[:SYNONYMS_PER_WORD]
+
+
+def build_lexicon(extra_words=()):
+    """Compile {word: top synonyms} for every WordNet lemma plus the given extra vocabulary"""
+    model_registry.get("nltk_data")
+    from nltk.corpus import wordnet
+
+    words = set(wordnet.all_lemma_names())
+    words.update(word.lower() for word in extra_words)
+    return {
+        "version": LEXICON_FORMAT_VERSION,
+        "synonyms": {word: wordnet_synonyms(word)[:SYNONYMS_PER_WORD] for word in sorted(words)}
+    }
+
+
+def save_lexicon(lexicon, path=LEXICON_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        pickle.dump(lexicon, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_lexicon(path=LEXICON_PATH):
+    """Load the compiled synonym table once per process, empty if it was never built"""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                try:
+                    with open(path, "rb") as f:
+                        data = pickle.load(f)
+                    if data.get("version") != LEXICON_FORMAT_VERSION:
+                        raise ValueError(f"unsupported lexicon version {data.get('version')}")
+                    _lexicon = data["synonyms"]
+                except (OSError, ValueError, pickle.UnpicklingError) as e:
+                    print(f"⚠️ Synonym lexicon not loaded ({e}), falling back to live WordNet")
+                    _lexicon = {}
+    return _lexicon
+
+
+def get_synonyms(word):
+    """Synonyms for a word from the compiled lexicon, with a bounded LRU over live WordNet for the tail"""
+    synonyms = load_lexicon().get(word)
+    if synonyms is None:
+        synonyms = _cached_wordnet_synonyms(word)
+    return list(synonyms)
@@ -0,0 +1,118 @@
+import os
+import time
+import threading
+
+# Production workers: load every registered model at startup instead of on the first request
+WARM_UP_MODELS = os.environ.get("WARM_UP_MODELS", "0") == "1"
+
+_loaders = {}
+_models = {}
+_locks = {}
+_registry_lock = threading.Lock()
+_warm_up = {"status": "not_requested", "error": None, "seconds": None}
+
+
+def register(name, loader):
+    """Register a zero-argument loader, called once on the first get(name)"""
+    with _registry_lock:
+        _loaders[name] = loader
+        _locks.setdefault(name, threading.Lock())
+
+
+def get(name):
+    """The model registered under name, loaded on first use (once per process)"""
+    if name in _models:
+        return _models[name]
+    with _locks[name]:
+        if name not in _models:
+            start = time.time()
+            _models[name] = _loaders[name]()
+            print(f"✅ Loaded {name} in {time.time() - start:.1f}s")
+    return _models[name]
+
+
+def is_loaded(name):
+    return name in _models
+
+
+def warm_up(names=None):
+    """Load the given models (default: all registered) now instead of on first use"""
+    _warm_up.update(status="running", error=None)
+    start = time.time()
+    try:
+        for name in names or list(_loaders):
+            get(name)
+    except Exception as e:
+        print("❌ Model warm-up failed:", e)
+        _warm_up.update(status="failed", error=str(e))
+        raise
+    _warm_up.update(status="done", seconds=round(time.time() - start, 2))
+
+
+def warm_up_in_background(names=None):
+    """Start warm_up in a daemon thread so the server can bind its port meanwhile"""
+    def run():
+        try:
+            warm_up(names)
+        except Exception:
+            pass
+
+    _warm_up.update(status="running", error=None)
+    thread = threading.Thread(target=run, name="model-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def readiness():
+    """Ready once a requested warm-up has finished, or immediately when models load lazily"""
+    return {
+        "ready": _warm_up["status"] in ("not_requested", "done"),
+        "warm_up": _warm_up["status"],
+        "warm_up_seconds": _warm_up["seconds"],
+        "error": _warm_up["error"],
+        "models": {name: is_loaded(name) for name in _loaders}
+    }
+
+
+def _load_nltk_data():
+    """Tokenizer and corpora used by ranking, downloaded once if missing"""
+    import nltk
+    for resource, package in [
+        ("tokenizers/punkt", "punkt"),
+        ("corpora/stopwords", "stopwords"),
+        ("corpora/wordnet", "wordnet")
+    ]:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            nltk.download(package)
+    return True
+
+
+def _load_stopwords():
+    get("nltk_data")
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words("english"))
+
+
+def _load_sentence_encoder():
+    from utils.embedding_store import MODEL_NAME
+    from utils.inference_backend import get_sentence_encoder
+    return get_sentence_encoder(MODEL_NAME)
+
+
+def _load_ner_pipeline():
+    from utils.inference_backend import NER_MODEL_ID, get_ner_pipeline
+    return get_ner_pipeline(NER_MODEL_ID)
+
+
+def _load_synonym_lexicon():
+    from utils.lexicon import load_lexicon
+    return load_lexicon()
+
+
+register("nltk_data", _load_nltk_data)
+register("stopwords", _load_stopwords)
+register("synonym_lexicon", _load_synonym_lexicon)
+register("sentence_encoder", _load_sentence_encoder)
+register("ner", _load_ner_pipeline)
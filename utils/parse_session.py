@@ -0,0 +1,85 @@
+import os
+import copy
+import secrets
+import datetime
+import threading
+from collections import OrderedDict
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+# Upload parses kept in memory, the persistent copy lives in Mongo (shared by every worker)
+PARSE_SESSION_CACHE_SIZE = int(os.environ.get("PARSE_SESSION_CACHE_SIZE", "1024"))
+# Forms left open longer than this fall back to the stored ResumeDocument on submit
+PARSE_SESSION_TTL_HOURS = int(os.environ.get("PARSE_SESSION_TTL_HOURS", "24"))
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017")
+db = client["resume_ranking_db"]
+session_collection = db["parse_sessions"]
+
+_sessions = OrderedDict()
+_lock = threading.Lock()
+_indexes_ready = False
+
+
+def _ensure_indexes():
+    global _indexes_ready
+    if not _indexes_ready:
+        session_collection.create_index("created_at", expireAfterSeconds=PARSE_SESSION_TTL_HOURS * 3600)
+        _indexes_ready = True
+
+
+def _expired(session):
+    age = datetime.datetime.utcnow() - session["created_at"]
+    return age > datetime.timedelta(hours=PARSE_SESSION_TTL_HOURS)
+
+
+def _cache_put(token, session):
+    with _lock:
+        _sessions[token] = session
+        _sessions.move_to_end(token)
+        while len(_sessions) > PARSE_SESSION_CACHE_SIZE:
+            _sessions.popitem(last=False)
+
+
+def create_session(parsed_data, filename):
+    """Store the /upload extraction under a new unguessable token for the form to send back"""
+    token = secrets.token_urlsafe(24)
+    session = {
+        "parsed_data": copy.deepcopy(parsed_data),
+        "resume_filename": filename,
+        "resume_sha256": parsed_data.get("resume_sha256"),
+        "created_at": datetime.datetime.utcnow()
+    }
+    _cache_put(token, session)
+    try:
+        _ensure_indexes()
+        session_collection.insert_one({"_id": token, **session})
+    except PyMongoError as e:
+        print("⚠️ Parse session write failed:", e)
+    return token
+
+
+def get_session(token, filename=None):
+    """Session for an upload token, None if unknown, expired or issued for a different file"""
+    if not token:
+        return None
+    with _lock:
+        session = _sessions.get(token)
+        if session is not None:
+            _sessions.move_to_end(token)
+    if session is None:
+        try:
+            session = session_collection.find_one({"_id": token}, {"_id": 0})
+        except PyMongoError as e:
+            print("⚠️ Parse session read failed:", e)
+            session = None
+        if session is None:
+            return None
+        _cache_put(token, session)
+    # Mongo's TTL monitor only runs once a minute, the in-memory copy never expires on its own
+    if _expired(session):
+        return None
+    if filename is not None and session["resume_filename"] != filename:
+        return None
+    return copy.deepcopy(session)
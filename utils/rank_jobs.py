@@ -0,0 +1,160 @@
+import os
+import datetime
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from bson import ObjectId
+from pymongo import MongoClient
+
+# Worker processes for background ranking, each loads the models once
+RANK_JOB_WORKERS = int(os.environ.get("RANK_JOB_WORKERS", "2"))
+# Applications scored between two progress updates
+CHUNK_SIZE = 16
+# A queued/running job with no heartbeat for this long died with its worker or app process
+RANK_JOB_STALE_SECONDS = int(os.environ.get("RANK_JOB_STALE_SECONDS", "600"))
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017")
+db = client["resume_ranking_db"]
+jobs_collection = db["rank_jobs"]
+
+_executor = None
+_executor_lock = threading.Lock()
+# job_id -> Future of jobs submitted by this process
+_futures = {}
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: MongoClient and torch are not fork-safe
+            _executor = ProcessPoolExecutor(
+                max_workers=RANK_JOB_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+    return _executor
+
+
+def _serialize_entry(entry):
+    return {
+        "resume_id": str(entry["resume_id"]),
+        "name": entry.get("name", "Unnamed"),
+        "email": entry.get("email", ""),
+        "filepath": entry.get("filepath"),
+        "score": entry["score"],
+        "detailed_scores": entry.get("detailed_scores", {}),
+        "raw_scores": entry.get("raw_scores", {}),
+        "reasoning": entry.get("reasoning", ""),
+        "highlights": entry.get("highlights") or []
+    }
+
+
+def run_rank_job(job_id):
+    """Worker entry point: bring the JD leaderboard up to date, reporting progress as it goes"""
+    from utils.leaderboard import load_jd_text, pending_applications, score_resumes, refresh_tfidf, read_leaderboard
+
+    job_id = ObjectId(job_id)
+    job = jobs_collection.find_one({"_id": job_id})
+    jd_id = job["jd_id"]
+    try:
+        jd_text = load_jd_text(jd_id)
+        if jd_text is None:
+            raise FileNotFoundError(f"JD PDF not found for {jd_id}")
+
+        pending = pending_applications(jd_id, jd_text)
+        now = datetime.datetime.utcnow()
+        jobs_collection.update_one({"_id": job_id}, {"$set": {
+            "status": "running", "total": len(pending), "scored": 0,
+            "started_at": now, "heartbeat_at": now
+        }})
+        for start in range(0, len(pending), CHUNK_SIZE):
+            chunk = pending[start:start + CHUNK_SIZE]
+            score_resumes(jd_id, jd_text, chunk)
+            jobs_collection.update_one({"_id": job_id}, {
+                "$inc": {"scored": len(chunk)}, "$set": {"heartbeat_at": datetime.datetime.utcnow()}
+            })
+
+        refresh_tfidf(jd_id, jd_text)
+        results = [_serialize_entry(entry) for entry in read_leaderboard(jd_id)]
+        jobs_collection.update_one({"_id": job_id}, {"$set": {
+            "status": "done", "results": results, "finished_at": datetime.datetime.utcnow()
+        }})
+    except Exception as e:
+        print(f"❌ Rank job {job_id} failed:", e)
+        jobs_collection.update_one({"_id": job_id}, {"$set": {
+            "status": "failed", "error": str(e), "finished_at": datetime.datetime.utcnow()
+        }})
+
+
+def _is_stale(job):
+    """An unfinished job whose worker is gone, i.e. not pending in this process and no recent heartbeat"""
+    if job["status"] not in ("queued", "running"):
+        return False
+    if str(job["_id"]) in _futures:
+        # Still queued or running in our pool, _job_finished handles a crashed worker
+        return False
+    last_seen = job.get("heartbeat_at") or job["created_at"]
+    return (datetime.datetime.utcnow() - last_seen).total_seconds() > RANK_JOB_STALE_SECONDS
+
+
+def _fail_unfinished(job_id, error):
+    jobs_collection.update_one({"_id": ObjectId(job_id), "status": {"$in": ["queued", "running"]}}, {"$set": {
+        "status": "failed", "error": error, "finished_at": datetime.datetime.utcnow()
+    }})
+
+
+def _job_finished(job_id, future):
+    global _executor
+    _futures.pop(job_id, None)
+    # run_rank_job records done/failed itself, a job still unfinished here lost its worker process
+    error = future.exception() if not future.cancelled() else None
+    if isinstance(error, BrokenProcessPool):
+        # A dead worker breaks the whole pool, the next job gets a new one
+        with _executor_lock:
+            _executor = None
+    _fail_unfinished(job_id, f"Job worker stopped before finishing: {error}" if error else "Job worker stopped before finishing")
+
+
+def submit_rank_job(jd_id):
+    """Queue a ranking job for a JD and return its id immediately (reuses an unfinished, live job)"""
+    jd_id = ObjectId(jd_id)
+    for active in jobs_collection.find({"jd_id": jd_id, "status": {"$in": ["queued", "running"]}}):
+        if not _is_stale(active):
+            return str(active["_id"])
+        print(f"⚠️ Rank job {active['_id']} is stale, marking it failed")
+        _fail_unfinished(active["_id"], "Job worker stopped before finishing")
+
+    job_id = jobs_collection.insert_one({
+        "jd_id": jd_id,
+        "status": "queued",
+        "scored": 0,
+        "total": None,
+        "created_at": datetime.datetime.utcnow()
+    }).inserted_id
+    future = _get_executor().submit(run_rank_job, str(job_id))
+    _futures[str(job_id)] = future
+    future.add_done_callback(lambda done: _job_finished(str(job_id), done))
+    return str(job_id)
+
+
+def get_job_status(job_id):
+    """Progress of a job as scored/total, plus the ordered results once it is done"""
+    job = jobs_collection.find_one({"_id": ObjectId(job_id)})
+    if not job:
+        return None
+    if _is_stale(job):
+        _fail_unfinished(job["_id"], "Job worker stopped before finishing")
+        job = jobs_collection.find_one({"_id": job["_id"]})
+    status = {
+        "job_id": str(job["_id"]),
+        "jd_id": str(job["jd_id"]),
+        "status": job["status"],
+        "scored": job.get("scored", 0),
+        "total": job.get("total")
+    }
+    if job["status"] == "done":
+        status["results"] = job.get("results", [])
+    if job["status"] == "failed":
+        status["error"] = job.get("error")
+    return status
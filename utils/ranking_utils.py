@@ -1,34 +1,59 @@
-from sentence_transformers import SentenceTransformer, util
 import re
+from bisect import bisect_right
 from collections import Counter
-import nltk
-from nltk.corpus import stopwords, wordnet
-from nltk.tokenize import word_tokenize, sent_tokenize
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import lru_cache, cached_property
 import numpy as np
-import torch
+import os
+import threading
+import multiprocessing
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from utils.embedding_store import MODEL_NAME, MODEL_VERSION, load_embeddings, save_embeddings
+from utils import model_registry
+from utils.tfidf_index import TFIDF_VERSION, compute_tfidf_similarities
+from utils.lexicon import get_synonyms
+from utils.term_matcher import TermMatcher
+from utils.tokenizer import fast_word_tokenize
+from utils.result_cache import cached_result
+from utils.chunking import split_into_chunks, aggregate_chunk_similarities
 warnings.filterwarnings('ignore')
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Processes for the per-resume lexical stage of rank_resumes_bulk (0 or 1 = serial)
+RANKING_WORKERS = int(os.environ.get("RANKING_WORKERS", "0"))
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Score semantic similarity on cached section/paragraph chunks instead of the truncated whole text
+SEMANTIC_CHUNKING = os.environ.get("SEMANTIC_CHUNKING", "1") == "1"
+CHUNK_AGGREGATION = os.environ.get("CHUNK_AGGREGATION", "max_mean")
 
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+# Word tokenizer for ranking: "fast" (compiled regex passes) or "nltk" (Punkt + Treebank)
+RANKING_TOKENIZER = os.environ.get("RANKING_TOKENIZER", "fast")
 
-# Initialize models
-model = SentenceTransformer("all-MiniLM-L6-v2")
+# Weights of the raw component scores in the final score
+SCORING_WEIGHTS = {'semantic': 0.5, 'tfidf': 0.3, 'term_overlap': 0.2}
+# scale_score parameters for the final score
+SCORE_SCALING = {'min_val': 0.0, 'max_val': 0.4, 'power': 1.2}
+
+# Cascade ranking: stage two keeps CASCADE_MULTIPLIER x no_of_candidates resumes
+CASCADE_MULTIPLIER = int(os.environ.get("CASCADE_MULTIPLIER", "5"))
+CASCADE_DEFAULT_SHORTLIST = 50
+
+def get_model():
+    """Sentence-BERT model (PyTorch or int8 ONNX per INFERENCE_BACKEND), loaded on first use so lexical pool workers never load it"""
+    return model_registry.get("sentence_encoder")
+
+def word_tokenize(text, tokenizer=None):
+    if (tokenizer or RANKING_TOKENIZER) == "fast":
+        return fast_word_tokenize(text)
+    # NLTK is imported (and its data checked) on first use, not when this module is imported
+    model_registry.get("nltk_data")
+    from nltk.tokenize import word_tokenize as nltk_word_tokenize
+    return nltk_word_tokenize(text)
+
+def sent_tokenize(text):
+    model_registry.get("nltk_data")
+    from nltk.tokenize import sent_tokenize as nltk_sent_tokenize
+    return nltk_sent_tokenize(text)
 
 # Domain knowledge for semantic expansion
 DOMAIN_KNOWLEDGE = {
@@ -202,16 +227,16 @@ DOMAIN_KNOWLEDGE = {
     'academic writing': ['research', 'publication', 'scholarly', 'writing', 'academic']
 }
 
-def get_synonyms(word):
-    """Get synonyms for a word using WordNet"""
-    synonyms = set()
-    for syn in wordnet.synsets(word):
-        for lemma in syn.lemmas():
-            synonyms.add(lemma.name())
-    return list(synonyms)
+# Every DOMAIN_KNOWLEDGE expansion term, compiled once into a single matcher
+DOMAIN_TERM_MATCHER = TermMatcher(
+    term for category_terms in DOMAIN_KNOWLEDGE.values() for term in category_terms
+)
+
+def semantic_expansion(text, max_expansions=50, deterministic=True):
+    """Expand text with synonyms and domain knowledge (deterministic mode is reproducible and cached)"""
+    if deterministic:
+        return _deterministic_expansion(text, max_expansions)
 
-def semantic_expansion(text, max_expansions=50):
-    """Expand text with synonyms and domain knowledge"""
     expanded_terms = []
     words = word_tokenize(text.lower())
     
@@ -234,7 +259,35 @@ def semantic_expansion(text, max_expansions=50):
     unique_terms = list(set(expanded_terms))
     return ' '.join(unique_terms[:max_expansions])
 
-def extract_key_terms_enhanced(text):
+# Bump when _expand_tokens changes which terms survive, cached results and leaderboards depend on it
+EXPANSION_VERSION = 2
+
+@lru_cache(maxsize=2048)
+def _deterministic_expansion(text, max_expansions):
+    return _expand_tokens(word_tokenize(text.lower()), max_expansions)
+
+def _expand_tokens(tokens, max_expansions):
+    """Every original token (first occurrence order) followed by at most max_expansions added terms"""
+    original_terms = {}
+    domain_terms = {}
+    synonym_counts = Counter()
+    
+    for word in tokens:
+        if len(word) < 3:
+            continue
+        original_terms.setdefault(word, None)
+        synonym_counts.update(get_synonyms(word)[:3])
+        for term in DOMAIN_KNOWLEDGE.get(word, []):
+            domain_terms.setdefault(term, None)
+    
+    # The cap applies to added terms only: domain terms first, then synonyms by frequency
+    added_terms = dict.fromkeys(term for term in domain_terms if term not in original_terms)
+    added_terms.update(dict.fromkeys(
+        term for term, _ in synonym_counts.most_common() if term not in original_terms
+    ))
+    return ' '.join(list(original_terms) + list(added_terms)[:max_expansions])
+
+def extract_key_terms_enhanced(text, tokens=None):
     """Enhanced key term extraction with semantic expansion"""
     # Clean and preprocess text
     text_lower = text.lower()
@@ -242,14 +295,8 @@ def extract_key_terms_enhanced(text):
     # Basic term extraction
     found_terms = []
     
-    # Extract technical/domain-specific terms
-    all_domain_terms = []
-    for category_terms in DOMAIN_KNOWLEDGE.values():
-        all_domain_terms.extend(category_terms)
-    
-    for term in all_domain_terms:
-        if term in text_lower:
-            found_terms.append(term)
+    # Extract technical/domain-specific terms (single pass, word boundaries)
+    found_terms.extend(DOMAIN_TERM_MATCHER.find_all(text_lower))
     
     # Extract experience patterns
     experience_patterns = re.findall(r'(\d+[\+]?\s*(?:years?|yrs?))', text_lower)
@@ -265,8 +312,8 @@ def extract_key_terms_enhanced(text):
     
     # Extract important nouns using NLTK
     try:
-        stop_words = set(stopwords.words('english'))
-        words = word_tokenize(text_lower)
+        stop_words = model_registry.get("stopwords")
+        words = tokens if tokens is not None else word_tokenize(text_lower)
         important_words = [word for word in words if word not in stop_words and len(word) > 3]
         
         # Find frequent important words
@@ -285,8 +332,61 @@ def extract_key_terms_enhanced(text):
     
     return list(set(found_terms))
 
+class AnalyzedDocument:
+    """Tokens, sentences, key terms and expansion of one text, computed once and shared by scoring, reasoning and highlights"""
+
+    def __init__(self, text):
+        self.text = text
+        self.text_lower = text.lower()
+
+    @cached_property
+    def tokens(self):
+        return word_tokenize(self.text_lower)
+
+    @cached_property
+    def sentences(self):
+        return sent_tokenize(self.text)
+
+    @cached_property
+    def key_terms(self):
+        return set(extract_key_terms_enhanced(self.text, tokens=self.tokens))
+
+    @cached_property
+    def expanded(self):
+        return _expand_tokens(self.tokens, 50)
+
+    @cached_property
+    def term_sentences(self):
+        """Inverted index: key term -> first sentence (over 20 chars) containing it, built in one pass"""
+        sentences = [s.strip() for s in self.sentences]
+        sentences = [s for s in sentences if len(s) > 20]
+        lowered = [s.lower() for s in sentences]
+        # One newline-joined haystack: a C-level find per term instead of a scan over every sentence
+        haystack = "\n".join(lowered)
+        starts = [0]
+        for s in lowered[:-1]:
+            starts.append(starts[-1] + len(s) + 1)
+        index = {}
+        for term in self.key_terms:
+            position = haystack.find(term.lower())
+            if position >= 0:
+                index[term] = sentences[bisect_right(starts, position) - 1]
+        return index
+
+    def analyze(self):
+        """Compute every field eagerly, e.g. before shipping the document across processes"""
+        self.tokens, self.sentences, self.key_terms, self.expanded
+        return self
+
+def analyze_document(doc):
+    """Return an AnalyzedDocument for raw text, or the document itself if already analyzed"""
+    return doc if isinstance(doc, AnalyzedDocument) else AnalyzedDocument(doc)
+
 def compute_tfidf_similarity(text1, text2):
     """Compute TF-IDF similarity between two texts"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
     try:
         vectorizer = TfidfVectorizer(
             max_features=1000,
@@ -306,19 +406,52 @@ def compute_tfidf_similarity(text1, text2):
     except Exception:
         return 0.0
 
+def get_embeddings(texts, batch_size=32):
+    """Return one embedding per text, encoding and persisting only those not stored yet"""
+    cached = load_embeddings(texts)
+    missing = [text for text in dict.fromkeys(texts) if text not in cached]
+    if missing:
+        encoded = get_model().encode(missing, batch_size=batch_size, convert_to_numpy=True)
+        save_embeddings(missing, encoded)
+        cached.update(zip(missing, np.asarray(encoded, dtype=np.float32)))
+    return np.vstack([cached[text] for text in texts])
+
+def precompute_embedding(text):
+    """Encode a cleaned document (whole and per chunk) once at ingestion so ranking only reads it back"""
+    if text:
+        get_embeddings([text] + split_into_chunks(text))
+
 def compute_semantic_similarity(text1, text2):
-    """Compute semantic similarity using Sentence-BERT"""
+    """Compute semantic similarity using stored Sentence-BERT embeddings"""
     try:
-        # Encode texts
-        embeddings1 = model.encode(text1, convert_to_tensor=True)
-        embeddings2 = model.encode(text2, convert_to_tensor=True)
-        
-        # Compute cosine similarity
-        similarity = util.pytorch_cos_sim(embeddings1, embeddings2).item()
-        return similarity
+        return float(compute_semantic_similarities(text1, [text2])[0])
     except Exception:
         return 0.0
 
+def compute_semantic_similarities(jd_text, resume_texts, batch_size=32):
+    """Cosine similarity of one JD against many resumes as a single matrix operation"""
+    if SEMANTIC_CHUNKING:
+        return compute_chunked_similarities(jd_text, resume_texts, batch_size=batch_size)
+    jd_embedding = get_embeddings([jd_text])[0]
+    resume_embeddings = get_embeddings(resume_texts, batch_size=batch_size)
+    norms = np.linalg.norm(resume_embeddings, axis=1) * np.linalg.norm(jd_embedding)
+    dots = resume_embeddings @ jd_embedding
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+def compute_chunked_similarities(jd_text, resume_texts, batch_size=32):
+    """Chunk-to-chunk similarity so text past MiniLM's 256 word-piece window still counts"""
+    jd_chunks = split_into_chunks(jd_text)
+    resume_chunks = [split_into_chunks(text) for text in resume_texts]
+    flat_chunks = [chunk for chunks in resume_chunks for chunk in chunks]
+    # One lookup/encode call so missing chunks of the JD and all resumes are batched together
+    vectors = get_embeddings(jd_chunks + flat_chunks, batch_size=batch_size)
+    return aggregate_chunk_similarities(
+        vectors[:len(jd_chunks)],
+        vectors[len(jd_chunks):],
+        [len(chunks) for chunks in resume_chunks],
+        mode=CHUNK_AGGREGATION
+    )
+
 def scale_score(raw_score, min_val=0.0, max_val=0.4, power=1.2):
     # Clip to [min_val, max_val]
     clipped = max(min(raw_score, max_val), min_val)
@@ -329,27 +462,39 @@ def scale_score(raw_score, min_val=0.0, max_val=0.4, power=1.2):
     # No shift: lowest is 0, highest is 1
     return round(boosted, 4)
 
+def scale_scores(raw_scores, min_val=0.0, max_val=0.4, power=1.2):
+    """Vectorized scale_score over a NumPy array of raw scores"""
+    clipped = np.clip(np.asarray(raw_scores, dtype=np.float64), min_val, max_val)
+    if max_val > min_val:
+        norm = (clipped - min_val) / (max_val - min_val)
+    else:
+        norm = np.zeros_like(clipped)
+    return np.round(norm ** power, 4)
+
 def compute_enhanced_similarity(jd_text, resume_text):
     """Compute enhanced similarity using multiple approaches, with score scaling"""
-    # 1. Semantic expansion
-    jd_expanded = semantic_expansion(jd_text)
-    resume_expanded = semantic_expansion(resume_text)
-    # 2. TF-IDF similarity on expanded texts
-    tfidf_score = compute_tfidf_similarity(jd_expanded, resume_expanded)
+    jd_doc = analyze_document(jd_text)
+    resume_doc = analyze_document(resume_text)
+    # 1-2. TF-IDF similarity on semantically expanded texts
+    tfidf_score = compute_tfidf_similarity(jd_doc.expanded, resume_doc.expanded)
     # 3. Semantic similarity using Sentence-BERT
-    semantic_score = compute_semantic_similarity(jd_text, resume_text)
+    semantic_score = compute_semantic_similarity(jd_doc.text, resume_doc.text)
     # 4. Key term overlap
-    jd_terms = extract_key_terms_enhanced(jd_text)
-    resume_terms = extract_key_terms_enhanced(resume_text)
-    common_terms = set(jd_terms) & set(resume_terms)
+    jd_terms = jd_doc.key_terms
+    resume_terms = resume_doc.key_terms
+    common_terms = jd_terms & resume_terms
     if len(jd_terms) > 0 and len(resume_terms) > 0:
         term_overlap_score = len(common_terms) / max(len(jd_terms), len(resume_terms))
     else:
         term_overlap_score = 0.0
     # 5. Weighted combination (raw)
-    final_score_raw = (0.5 * semantic_score) + (0.3 * tfidf_score) + (0.2 * term_overlap_score)
+    final_score_raw = (
+        SCORING_WEIGHTS['semantic'] * semantic_score
+        + SCORING_WEIGHTS['tfidf'] * tfidf_score
+        + SCORING_WEIGHTS['term_overlap'] * term_overlap_score
+    )
     # 6. Scale all scores for more intuitive output
-    final_score = scale_score(final_score_raw)
+    final_score = scale_score(final_score_raw, **SCORE_SCALING)
     semantic_score_scaled = scale_score(semantic_score)
     tfidf_score_scaled = scale_score(tfidf_score)
     term_overlap_score_scaled = scale_score(term_overlap_score, min_val=0.0, max_val=1.0, power=1.2)
@@ -358,48 +503,113 @@ def compute_enhanced_similarity(jd_text, resume_text):
         'semantic_score': semantic_score_scaled,
         'tfidf_score': tfidf_score_scaled,
         'term_overlap_score': term_overlap_score_scaled,
-        'common_terms': list(common_terms)
+        'raw_scores': {
+            'semantic': float(semantic_score),
+            'tfidf': float(tfidf_score),
+            'term_overlap': float(term_overlap_score)
+        },
+        'common_terms': sorted(common_terms)
+    }
+
+def compute_bulk_similarity(jd_text, resume_texts, batch_size=32):
+    """Score one JD against many resumes, returns NumPy arrays of (scaled) component scores"""
+    jd_doc = analyze_document(jd_text)
+    resume_docs = [analyze_document(text) for text in resume_texts]
+    # 1. Semantic similarity for all resumes at once, JD encoded a single time
+    semantic_scores = compute_semantic_similarities(
+        jd_doc.text, [doc.text for doc in resume_docs], batch_size=batch_size
+    )
+    # 2. TF-IDF similarity on expanded texts, one model per JD fit on all applicants
+    tfidf_scores = compute_tfidf_similarities(jd_doc.expanded, [doc.expanded for doc in resume_docs])
+    # 3. Key term overlap, JD terms extracted once
+    term_overlap_scores, common_terms = compute_term_overlaps(jd_doc, resume_docs)
+    # 4. Weighted combination (raw) and scaling
+    return combine_component_scores(semantic_scores, tfidf_scores, term_overlap_scores, common_terms)
+
+def compute_term_overlaps(jd_doc, resume_docs):
+    """Key-term overlap of one analyzed JD with many analyzed resumes, plus the sorted common terms"""
+    jd_terms = jd_doc.key_terms
+    term_overlap_scores = np.zeros(len(resume_docs))
+    common_terms = []
+    for i, doc in enumerate(resume_docs):
+        resume_terms = doc.key_terms
+        common = jd_terms & resume_terms
+        common_terms.append(sorted(common))
+        if jd_terms and resume_terms:
+            term_overlap_scores[i] = len(common) / max(len(jd_terms), len(resume_terms))
+    return term_overlap_scores, common_terms
+
+def reweight_scores(semantic_scores, tfidf_scores, term_overlap_scores, weights=None, scaling=None):
+    """Final scores from raw component arrays under any weights/scaling, no text or model involved"""
+    weights = {**SCORING_WEIGHTS, **(weights or {})}
+    scaling = {**SCORE_SCALING, **(scaling or {})}
+    final_raw = (
+        weights['semantic'] * np.asarray(semantic_scores, dtype=np.float64)
+        + weights['tfidf'] * np.asarray(tfidf_scores, dtype=np.float64)
+        + weights['term_overlap'] * np.asarray(term_overlap_scores, dtype=np.float64)
+    )
+    return scale_scores(final_raw, **scaling)
+
+def scale_components(semantic_scores, tfidf_scores, term_overlap_scores):
+    """Display scaling of each raw component, fixed whatever weights/scaling the final score uses"""
+    return (
+        scale_scores(semantic_scores),
+        scale_scores(tfidf_scores),
+        scale_scores(term_overlap_scores, min_val=0.0, max_val=1.0, power=1.2)
+    )
+
+def combine_component_scores(semantic_scores, tfidf_scores, term_overlap_scores, common_terms):
+    """Weighted combination of raw component arrays, scaled for display"""
+    semantic, tfidf, term_overlap = scale_components(semantic_scores, tfidf_scores, term_overlap_scores)
+    return {
+        'final_score': reweight_scores(semantic_scores, tfidf_scores, term_overlap_scores),
+        'raw_semantic': np.asarray(semantic_scores, dtype=np.float64),
+        'raw_tfidf': np.asarray(tfidf_scores, dtype=np.float64),
+        'raw_term_overlap': np.asarray(term_overlap_scores, dtype=np.float64),
+        'semantic_score': semantic,
+        'tfidf_score': tfidf,
+        'term_overlap_score': term_overlap,
+        'common_terms': common_terms
     }
 
 def find_matching_highlights_enhanced(jd_text, resume_text):
     """Enhanced matching highlights with semantic expansion"""
-    jd_terms = extract_key_terms_enhanced(jd_text)
-    resume_terms = extract_key_terms_enhanced(resume_text)
+    jd_doc = analyze_document(jd_text)
+    resume_doc = analyze_document(resume_text)
     
     # Find common terms
-    common_terms = list(set(jd_terms) & set(resume_terms))
+    common_terms = sorted(jd_doc.key_terms & resume_doc.key_terms)
     
-    # Extract sentences containing matching terms
+    # First sentence containing each term, looked up in each document's term index
     highlights = []
-    jd_sentences = sent_tokenize(jd_text)
-    resume_sentences = sent_tokenize(resume_text)
+    jd_index = jd_doc.term_sentences
+    resume_index = resume_doc.term_sentences
     
     for term in common_terms[:10]:
-        # Find JD sentences with this term
-        jd_matches = [s.strip() for s in jd_sentences if term.lower() in s.lower() and len(s.strip()) > 20]
-        # Find resume sentences with this term
-        resume_matches = [s.strip() for s in resume_sentences if term.lower() in s.lower() and len(s.strip()) > 20]
+        jd_match = jd_index.get(term)
+        resume_match = resume_index.get(term)
         
-        if jd_matches and resume_matches:
+        if jd_match and resume_match:
             highlights.append({
                 'term': term,
-                'jd_context': jd_matches[0][:150] + "..." if len(jd_matches[0]) > 150 else jd_matches[0],
-                'resume_context': resume_matches[0][:150] + "..." if len(resume_matches[0]) > 150 else resume_matches[0]
+                'jd_context': jd_match[:150] + "..." if len(jd_match) > 150 else jd_match,
+                'resume_context': resume_match[:150] + "..." if len(resume_match) > 150 else resume_match
             })
     
     return highlights[:5]
 
 def generate_reasoning_enhanced(jd_text, resume_text, similarity_result):
     """Generate enhanced reasoning with detailed breakdown"""
-    jd_terms = extract_key_terms_enhanced(jd_text)
-    resume_terms = extract_key_terms_enhanced(resume_text)
-    
-    common_terms = similarity_result['common_terms']
-    final_score = similarity_result['final_score']
-    semantic_score = similarity_result['semantic_score']
-    tfidf_score = similarity_result['tfidf_score']
-    term_overlap_score = similarity_result['term_overlap_score']
-    
+    return reasoning_from_scores(
+        similarity_result['final_score'],
+        similarity_result['semantic_score'],
+        similarity_result['tfidf_score'],
+        similarity_result['term_overlap_score'],
+        similarity_result['common_terms']
+    )
+
+def reasoning_from_scores(final_score, semantic_score, tfidf_score, term_overlap_score, common_terms):
+    """Reasoning text from (scaled) scores and common terms alone, so stored entries can regenerate it"""
     reasoning = []
     
     # Overall assessment
@@ -431,7 +641,19 @@ def generate_reasoning_enhanced(jd_text, resume_text, similarity_result):
     
     return " | ".join(reasoning)
 
-def rank_resumes_with_reasoning(jd_text, resume_text):
+def scoring_config():
+    """Everything besides the two texts that changes a ranking result, part of the result cache key"""
+    return {
+        'weights': SCORING_WEIGHTS,
+        'scaling': SCORE_SCALING,
+        'model': f"{MODEL_NAME}:{MODEL_VERSION}",
+        'tokenizer': RANKING_TOKENIZER,
+        'expansion': EXPANSION_VERSION,
+        'tfidf': TFIDF_VERSION,
+        'chunking': CHUNK_AGGREGATION if SEMANTIC_CHUNKING else None
+    }
+
+def rank_resumes_with_reasoning(jd_text, resume_text, use_cache=True):
     """Enhanced ranking function with advanced semantic analysis"""
     if not jd_text or not resume_text:
         return {
@@ -439,15 +661,27 @@ def rank_resumes_with_reasoning(jd_text, resume_text):
             'reasoning': "Unable to process empty text",
             'highlights': []
         }
+    if not use_cache or isinstance(jd_text, AnalyzedDocument) or isinstance(resume_text, AnalyzedDocument):
+        return _rank_resumes_with_reasoning(jd_text, resume_text)
+    # Repeat views of an unchanged JD/resume pair are served from the result cache
+    return cached_result(
+        jd_text, resume_text, scoring_config(),
+        lambda: _rank_resumes_with_reasoning(jd_text, resume_text)
+    )
+
+def _rank_resumes_with_reasoning(jd_text, resume_text):
+    # Analyze each document once for scoring, reasoning and highlights
+    jd_doc = analyze_document(jd_text)
+    resume_doc = analyze_document(resume_text)
     
     # Compute enhanced similarity
-    similarity_result = compute_enhanced_similarity(jd_text, resume_text)
+    similarity_result = compute_enhanced_similarity(jd_doc, resume_doc)
     
     # Generate reasoning
-    reasoning = generate_reasoning_enhanced(jd_text, resume_text, similarity_result)
+    reasoning = generate_reasoning_enhanced(jd_doc, resume_doc, similarity_result)
     
     # Find highlights
-    highlights = find_matching_highlights_enhanced(jd_text, resume_text)
+    highlights = find_matching_highlights_enhanced(jd_doc, resume_doc)
     
     return {
         'score': similarity_result['final_score'],
@@ -457,15 +691,184 @@ def rank_resumes_with_reasoning(jd_text, resume_text):
             'semantic': similarity_result['semantic_score'],
             'tfidf': similarity_result['tfidf_score'],
             'term_overlap': similarity_result['term_overlap_score']
-        }
+        },
+        'raw_scores': similarity_result['raw_scores']
+    }
+
+_lexical_pool = None
+_lexical_pool_lock = threading.Lock()
+
+def _init_lexical_worker():
+    """Load lexicons and NLTK data once per pool worker"""
+    for name in ("nltk_data", "stopwords", "synonym_lexicon"):
+        model_registry.get(name)
+    sent_tokenize("Warm up. Punkt.")
+
+def _lexical_analysis(jd_doc, resume_text, with_highlights=True):
+    """Per-resume pure-Python work: tokenization, expansion, key terms and highlights"""
+    resume_doc = AnalyzedDocument(resume_text).analyze()
+    highlights = find_matching_highlights_enhanced(jd_doc, resume_doc) if with_highlights else None
+    return resume_doc, highlights
+
+def _get_lexical_pool(workers):
+    global _lexical_pool
+    with _lexical_pool_lock:
+        if _lexical_pool is None or _lexical_pool._max_workers != workers:
+            if _lexical_pool is not None:
+                _lexical_pool.shutdown(wait=False)
+            _lexical_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_lexical_worker
+            )
+    return _lexical_pool
+
+def _run_lexical_stage(jd_doc, resume_texts, workers=None, with_highlights=True):
+    """Analyze resumes and build highlights, spread over the process pool when configured"""
+    workers = RANKING_WORKERS if workers is None else workers
+    if workers > 1 and len(resume_texts) > 1:
+        global _lexical_pool
+        try:
+            chunksize = max(1, len(resume_texts) // (workers * 4))
+            return list(_get_lexical_pool(workers).map(
+                _lexical_analysis, [jd_doc] * len(resume_texts), resume_texts,
+                [with_highlights] * len(resume_texts), chunksize=chunksize
+            ))
+        except BrokenProcessPool as e:
+            print("⚠️ Lexical worker pool failed, falling back to serial:", e)
+            with _lexical_pool_lock:
+                _lexical_pool = None
+    return [_lexical_analysis(jd_doc, text, with_highlights) for text in resume_texts]
+
+def _empty_ranking(n):
+    return {
+        'scores': np.zeros(n),
+        'semantic': np.zeros(n),
+        'tfidf': np.zeros(n),
+        'term_overlap': np.zeros(n),
+        'raw_semantic': np.zeros(n),
+        'raw_tfidf': np.zeros(n),
+        'raw_term_overlap': np.zeros(n),
+        'reasoning': ["Unable to process empty text"] * n,
+        'highlights': [[] for _ in range(n)],
+        'common_terms': [[] for _ in range(n)],
+        'expanded': [''] * n
+    }
+
+def _similarity_result(similarity, j):
+    return {
+        'final_score': float(similarity['final_score'][j]),
+        'semantic_score': float(similarity['semantic_score'][j]),
+        'tfidf_score': float(similarity['tfidf_score'][j]),
+        'term_overlap_score': float(similarity['term_overlap_score'][j]),
+        'common_terms': similarity['common_terms'][j]
     }
 
+def rank_resumes_bulk(jd_text, resume_texts, batch_size=32, workers=None, with_highlights=True):
+    """Rank many resumes against one JD, returns score arrays plus per-resume reasoning/highlights
+
+    With with_highlights=False highlights are left as None, to be generated
+    later only for the results someone actually looks at.
+    """
+    n = len(resume_texts)
+    result = _empty_ranking(n)
+    valid = [i for i, text in enumerate(resume_texts) if text]
+    if not jd_text or not valid:
+        return result
+
+    # The JD is analyzed once and shared across every resume in the run; the
+    # per-resume lexical work may run in worker processes, inference stays batched here
+    jd_doc = analyze_document(jd_text).analyze()
+    lexical = _run_lexical_stage(jd_doc, [resume_texts[i] for i in valid], workers=workers, with_highlights=with_highlights)
+    resume_docs = [doc for doc, _ in lexical]
+    similarity = compute_bulk_similarity(jd_doc, resume_docs, batch_size=batch_size)
+    result['scores'][valid] = similarity['final_score']
+    result['semantic'][valid] = similarity['semantic_score']
+    result['tfidf'][valid] = similarity['tfidf_score']
+    result['term_overlap'][valid] = similarity['term_overlap_score']
+    for component in ('raw_semantic', 'raw_tfidf', 'raw_term_overlap'):
+        result[component][valid] = similarity[component]
+
+    for j, i in enumerate(valid):
+        similarity_result = _similarity_result(similarity, j)
+        result['reasoning'][i] = generate_reasoning_enhanced(jd_doc, resume_docs[j], similarity_result)
+        result['highlights'][i] = lexical[j][1]
+        result['common_terms'][i] = similarity_result['common_terms']
+        result['expanded'][i] = resume_docs[j].expanded
+    return result
+
+def cascade_shortlist_size(n, no_of_candidates=None, shortlist_size=None):
+    """Stage-two size M: explicit, else CASCADE_MULTIPLIER x no_of_candidates, else CASCADE_DEFAULT_SHORTLIST"""
+    if shortlist_size:
+        m = int(shortlist_size)
+    else:
+        try:
+            m = CASCADE_MULTIPLIER * int(no_of_candidates)
+        except (TypeError, ValueError):
+            m = CASCADE_DEFAULT_SHORTLIST
+    return max(1, min(n, m))
+
+def rank_resumes_cascade(jd_text, resume_texts, no_of_candidates=None, shortlist_size=None, batch_size=32, workers=None):
+    """Two-stage ranking: cheap lexical prefilter for everyone, SBERT and highlights only for the top M
+
+    Resumes outside the shortlist are scored without the semantic component and
+    come after the shortlist in result['order'].
+    """
+    n = len(resume_texts)
+    result = _empty_ranking(n)
+    result['shortlisted'] = np.zeros(n, dtype=bool)
+    result['order'] = np.arange(n)
+    valid = [i for i, text in enumerate(resume_texts) if text]
+    if not jd_text or not valid:
+        return result
+
+    # Stage one: key-term overlap and cached per-JD TF-IDF for every applicant
+    jd_doc = analyze_document(jd_text).analyze()
+    lexical = _run_lexical_stage(jd_doc, [resume_texts[i] for i in valid], workers=workers, with_highlights=False)
+    resume_docs = [doc for doc, _ in lexical]
+    tfidf_scores = compute_tfidf_similarities(jd_doc.expanded, [doc.expanded for doc in resume_docs])
+    term_overlap_scores, common_terms = compute_term_overlaps(jd_doc, resume_docs)
+    prefilter = (SCORING_WEIGHTS['tfidf'] * tfidf_scores) + (SCORING_WEIGHTS['term_overlap'] * term_overlap_scores)
+
+    # Stage two: semantic similarity and highlights for the shortlist only
+    m = cascade_shortlist_size(len(resume_docs), no_of_candidates, shortlist_size)
+    shortlist = np.argsort(-prefilter, kind='stable')[:m]
+    semantic_scores = np.zeros(len(resume_docs))
+    semantic_scores[shortlist] = compute_semantic_similarities(
+        jd_doc.text, [resume_docs[j].text for j in shortlist], batch_size=batch_size
+    )
+    similarity = combine_component_scores(semantic_scores, tfidf_scores, term_overlap_scores, common_terms)
+
+    in_shortlist = np.zeros(len(resume_docs), dtype=bool)
+    in_shortlist[shortlist] = True
+
+    valid = np.array(valid)
+    result['scores'][valid] = similarity['final_score']
+    result['semantic'][valid] = similarity['semantic_score']
+    result['tfidf'][valid] = similarity['tfidf_score']
+    result['term_overlap'][valid] = similarity['term_overlap_score']
+    for component in ('raw_semantic', 'raw_tfidf', 'raw_term_overlap'):
+        result[component][valid] = similarity[component]
+    result['shortlisted'][valid] = in_shortlist
+    for j, i in enumerate(valid):
+        result['common_terms'][i] = common_terms[j]
+        result['expanded'][i] = resume_docs[j].expanded
+        if in_shortlist[j]:
+            result['reasoning'][i] = generate_reasoning_enhanced(jd_doc, resume_docs[j], _similarity_result(similarity, j))
+            result['highlights'][i] = find_matching_highlights_enhanced(jd_doc, resume_docs[j])
+        else:
+            result['reasoning'][i] = "Not shortlisted by the lexical prefilter | " + (
+                f"TF-IDF similarity: {similarity['tfidf_score'][j]:.3f} | "
+                f"Term overlap: {similarity['term_overlap_score'][j]:.3f}"
+            )
+    # Rank order: shortlist first, then by score
+    result['order'] = np.lexsort((-result['scores'], ~result['shortlisted']))
+    return result
+
 # Keep original function for backward compatibility
 def rank_resumes(jd_text, resume_text):
     """Original ranking function for backward compatibility"""
     if not jd_text or not resume_text:
         return 0.0
-    jd_emb = model.encode(jd_text, convert_to_tensor=True)
-    resume_emb = model.encode(resume_text, convert_to_tensor=True)
-    score = util.pytorch_cos_sim(jd_emb, resume_emb).item()
+    score = compute_semantic_similarity(jd_text, resume_text)
     return round(score, 4) 
\ No newline at end of file
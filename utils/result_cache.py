@@ -0,0 +1,94 @@
+import os
+import copy
+import json
+import hashlib
+import datetime
+import threading
+from collections import OrderedDict
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+# In-process LRU tier size (entries), the persistent tier lives in Mongo
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "4096"))
+# Orphaned entries (edited JDs, old models or weights) are never read again and expire after this
+RESULT_CACHE_TTL_DAYS = int(os.environ.get("RESULT_CACHE_TTL_DAYS", "30"))
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017")
+db = client["resume_ranking_db"]
+result_collection = db["ranking_results"]
+
+_lru = OrderedDict()
+_lru_lock = threading.Lock()
+_indexes_ready = False
+
+
+def _ensure_indexes():
+    global _indexes_ready
+    if not _indexes_ready:
+        result_collection.create_index("created_at", expireAfterSeconds=RESULT_CACHE_TTL_DAYS * 86400)
+        _indexes_ready = True
+
+
+def _text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def result_key(jd_text, resume_text, config):
+    """JD hash + resume hash + scoring config (weights, model version, ...): any change gives a new key"""
+    config_hash = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{_text_hash(jd_text)}:{_text_hash(resume_text)}:{config_hash}"
+
+
+def _lru_get(key):
+    with _lru_lock:
+        if key in _lru:
+            _lru.move_to_end(key)
+            return _lru[key]
+    return None
+
+
+def _lru_put(key, result):
+    with _lru_lock:
+        _lru[key] = result
+        _lru.move_to_end(key)
+        while len(_lru) > RESULT_CACHE_SIZE:
+            _lru.popitem(last=False)
+
+
+def cached_result(jd_text, resume_text, config, compute):
+    """Result for a JD/resume pair from the LRU or Mongo tier, calling compute() only on a miss"""
+    key = result_key(jd_text, resume_text, config)
+    result = _lru_get(key)
+    if result is not None:
+        # Callers may mutate what they get back, the cached copy must stay intact
+        return copy.deepcopy(result)
+
+    try:
+        doc = result_collection.find_one({"_id": key})
+    except PyMongoError as e:
+        print("⚠️ Result cache read failed:", e)
+        doc = None
+    if doc:
+        _lru_put(key, copy.deepcopy(doc["result"]))
+        return doc["result"]
+
+    result = compute()
+    _lru_put(key, copy.deepcopy(result))
+    try:
+        _ensure_indexes()
+        result_collection.replace_one({"_id": key}, {
+            "result": result,
+            "created_at": datetime.datetime.utcnow()
+        }, upsert=True)
+    except PyMongoError as e:
+        print("⚠️ Result cache write failed:", e)
+    return result
+
+
+def clear_result_cache(persistent=False):
+    """Drop the LRU tier, and optionally every persisted result"""
+    with _lru_lock:
+        _lru.clear()
+    if persistent:
+        result_collection.delete_many({})
@@ -0,0 +1,172 @@
+import os
+import hashlib
+import datetime
+import threading
+from collections import OrderedDict
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from utils.resume_text_utils import clean_text
+
+# Bump when extraction changes so stored documents are re-parsed from the PDF
+DOCUMENT_VERSION = 1
+# Parsed documents kept in memory, the persistent copy lives in Mongo
+DOCUMENT_CACHE_SIZE = int(os.environ.get("DOCUMENT_CACHE_SIZE", "512"))
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017")
+db = client["resume_ranking_db"]
+document_collection = db["resume_documents"]
+
+_documents = OrderedDict()
+# path -> (mtime_ns, size, sha256): files already hashed by this process are not read again
+_path_hashes = {}
+_lock = threading.Lock()
+
+
+class ResumeDocument:
+    """Text, embedded links and page metadata of one PDF, extracted in a single fitz.open"""
+
+    def __init__(self, sha256, text, links, pages, metadata=None, size=0):
+        self.sha256 = sha256
+        self.text = text
+        self.links = links
+        self.pages = pages
+        self.metadata = metadata or {}
+        self.size = size
+
+    @property
+    def cleaned_text(self):
+        return clean_text(self.text)
+
+    @property
+    def uris(self):
+        return [link["uri"] for link in self.links]
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    @classmethod
+    def from_bytes(cls, data, sha256=None, max_pages=None):
+        import fitz  # PyMuPDF
+
+        text, links, pages = "", [], []
+        with fitz.open(stream=data, filetype="pdf") as pdf:
+            # Checked before any text extraction so an oversized scan costs only the open
+            if max_pages and pdf.page_count > max_pages:
+                raise ValueError(f"PDF has {pdf.page_count} pages, the limit is {max_pages}")
+            metadata = {key: value for key, value in (pdf.metadata or {}).items() if value}
+            for number, page in enumerate(pdf):
+                page_text = page.get_text()
+                text += page_text
+                page_links = [link["uri"] for link in page.get_links() if "uri" in link]
+                links.extend({"page": number, "uri": uri} for uri in page_links)
+                pages.append({
+                    "number": number,
+                    "width": page.rect.width,
+                    "height": page.rect.height,
+                    "rotation": page.rotation,
+                    "chars": len(page_text),
+                    "links": len(page_links)
+                })
+        return cls(sha256 or hashlib.sha256(data).hexdigest(), text, links, pages, metadata, len(data))
+
+    def to_mongo(self):
+        return {
+            "_id": self.sha256,
+            "version": DOCUMENT_VERSION,
+            "text": self.text,
+            "links": self.links,
+            "pages": self.pages,
+            "page_count": self.page_count,
+            "metadata": self.metadata,
+            "size": self.size,
+            "parsed_at": datetime.datetime.utcnow()
+        }
+
+    @classmethod
+    def from_mongo(cls, doc):
+        return cls(doc["_id"], doc["text"], doc["links"], doc["pages"], doc.get("metadata"), doc.get("size", 0))
+
+
+def _cache_put(document):
+    with _lock:
+        _documents[document.sha256] = document
+        _documents.move_to_end(document.sha256)
+        while len(_documents) > DOCUMENT_CACHE_SIZE:
+            _documents.popitem(last=False)
+
+
+def get_document(sha256):
+    """Stored document for a content hash from memory or Mongo, None if it was never parsed"""
+    with _lock:
+        document = _documents.get(sha256)
+        if document is not None:
+            _documents.move_to_end(sha256)
+            return document
+    try:
+        doc = document_collection.find_one({"_id": sha256, "version": DOCUMENT_VERSION})
+    except PyMongoError as e:
+        print("⚠️ Resume document read failed:", e)
+        doc = None
+    if not doc:
+        return None
+    document = ResumeDocument.from_mongo(doc)
+    _cache_put(document)
+    return document
+
+
+def save_document(document):
+    _cache_put(document)
+    try:
+        document_collection.replace_one({"_id": document.sha256}, document.to_mongo(), upsert=True)
+    except PyMongoError as e:
+        print("⚠️ Resume document write failed:", e)
+
+
+def _known_hash(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    cached = _path_hashes.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    return None
+
+
+def open_document(path):
+    """The ResumeDocument for a PDF, parsing it only if these exact bytes were never seen before"""
+    sha256 = _known_hash(path)
+    document = get_document(sha256) if sha256 else None
+    if document is not None:
+        return document
+
+    with open(path, "rb") as f:
+        data = f.read()
+    sha256 = hashlib.sha256(data).hexdigest()
+    stat = os.stat(path)
+    _path_hashes[path] = (stat.st_mtime_ns, stat.st_size, sha256)
+    document = get_document(sha256)
+    if document is None:
+        document = ResumeDocument.from_bytes(data, sha256)
+        save_document(document)
+    return document
+
+
+def document_for(resume):
+    """Document of a stored application (form_extractions or leaderboard entry), via its stored hash when present"""
+    sha256 = resume.get("resume_sha256")
+    document = get_document(sha256) if sha256 else None
+    if document is not None:
+        return document
+    filepath = resume.get("resume_filepath") or resume.get("filepath")
+    if not filepath or not os.path.exists(filepath):
+        return None
+    return open_document(filepath)
+
+
+def resume_text(resume):
+    """Cleaned text of a stored application, empty if its file is gone and was never parsed"""
+    document = document_for(resume)
+    return document.cleaned_text if document else ""
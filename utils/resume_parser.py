@@ -1,4 +1,4 @@
-import fitz
+from utils.resume_document import open_document
 from utils.extractors.personal import extract_personal
 from utils.extractors.education import extract_education
 from utils.extractors.experience import extract_experience
@@ -7,10 +7,12 @@ from utils.extractors.links import extract_links
 from utils.extractors.projects import extract_projects
 
 def parse_resume(file_path):
-    text = ""
-    with fitz.open(file_path) as doc:
-        for page in doc:
-            text += page.get_text()
+    # One fitz.open per distinct file: text, links and pages are stored under its SHA-256
+    return parse_document(open_document(file_path))
+
+def parse_document(document):
+    """Run every extractor on an already opened ResumeDocument (e.g. parsed from upload bytes)"""
+    text = document.text
 
     parsed_data = {
         "personal_details": extract_personal(text),
@@ -18,7 +20,8 @@ def parse_resume(file_path):
         "experience": extract_experience(text),              # Returns 1 experience dict (auto-filled one)
         "skills": extract_skills(text),                     # Returns dict of key_skills, soft_skills, tools
         "projects": extract_projects(text),
-        "links": extract_links(text, file_path)                         # Returns dict with linkedin, website, social[]
+        "links": extract_links(text, uris=document.uris),             # Returns dict with linkedin, website, social[]
+        "resume_sha256": document.sha256                                 # Key of the stored ResumeDocument
     }
 
     print("🔍 RESUME PARSING RESULTS:")
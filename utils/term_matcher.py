@@ -0,0 +1,56 @@
+import re
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+def _build_trie(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    return trie
+
+
+def _trie_regex(node):
+    """Turn a character trie into a regex whose alternation shares common prefixes"""
+    alternatives = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not alternatives:
+        return ''
+    body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    if '' in node:
+        # Greedy optional: try the longer term first, fall back to the shorter one
+        body = '(?:' + body + ')?'
+    return body
+
+
+class TermMatcher:
+    """Multi-term matcher with word-boundary semantics, compiled once into a trie-shaped regex
+
+    find_all is a single left-to-right pass over the text. Overlapping terms are
+    reported too, e.g. both "machine learning" and "learning".
+    """
+
+    def __init__(self, terms):
+        self.terms = sorted({term.lower() for term in terms if term})
+        trie_pattern = _trie_regex(_build_trie(self.terms)) or '(?!)'
+        self.pattern = re.compile(r'(?<!\w)(?=(' + trie_pattern + r')(?!\w))')
+        # Shorter terms that are word-boundary prefixes of a longer one ("web" in "web services")
+        self.prefixes = {
+            term: [t for t in self.terms
+                   if len(t) < len(term) and term.startswith(t) and not _is_word_char(term[len(t)])]
+            for term in self.terms
+        }
+
+    def find_all(self, text):
+        """Return the distinct terms occurring in (lowercased) text, in order of first occurrence"""
+        found = {}
+        for match in self.pattern.finditer(text):
+            term = match.group(1)
+            found.setdefault(term, None)
+            for prefix in self.prefixes[term]:
+                found.setdefault(prefix, None)
+        return list(found)
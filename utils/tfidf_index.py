@@ -0,0 +1,138 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# How many per-JD models to keep in memory
+MAX_CACHED_JDS = 64
+# Refit the vocabulary/IDF once the documents added since the last fit exceed this share of the corpus
+REFIT_RATIO = 0.25
+# Below this corpus size max_df would drop every term the JD shares with its few applicants
+MAX_DF_MIN_DOCS = 20
+# Bump when the vectorizer setup changes, stored TF-IDF components depend on it
+TFIDF_VERSION = 2
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _doc_key(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class JDTfidfModel:
+    """TF-IDF model fit on one JD plus all of its applicants' expanded texts"""
+
+    def __init__(self, jd_text):
+        self.jd_text = jd_text
+        self.vectorizer = None
+        self.jd_vector = None
+        self.matrix = None
+        self.texts = []
+        self.rows = {}
+        self.fitted_size = 0
+        self.added_since_fit = 0
+        self.lock = threading.Lock()
+
+    def _new_vectorizer(self, n_docs):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        return TfidfVectorizer(
+            max_features=1000,
+            stop_words='english',
+            ngram_range=(1, 2),
+            min_df=1,
+            max_df=0.95 if n_docs >= MAX_DF_MIN_DOCS else 1.0
+        )
+
+    def fit(self, texts):
+        """Fit vocabulary and IDF on the JD plus the given resume texts"""
+        texts = list(dict.fromkeys(texts))
+        vectorizer = self._new_vectorizer(len(texts) + 1)
+        tfidf_matrix = vectorizer.fit_transform([self.jd_text] + texts)
+        self.vectorizer = vectorizer
+        self.texts = texts
+        self.rows = {_doc_key(text): i for i, text in enumerate(texts)}
+        self.jd_vector = tfidf_matrix[0]
+        self.matrix = tfidf_matrix[1:]
+        self.fitted_size = len(self.texts) + 1
+        self.added_since_fit = 0
+
+    def update(self, texts):
+        """Add unseen resume texts, transforming them with the fitted vocabulary or refitting when stale"""
+        import scipy.sparse as sp
+
+        new_texts = [text for text in dict.fromkeys(texts) if _doc_key(text) not in self.rows]
+        if self.vectorizer is None:
+            self.fit(new_texts)
+            return
+        if not new_texts:
+            return
+        if self.added_since_fit + len(new_texts) > REFIT_RATIO * self.fitted_size:
+            self.fit(self.texts + new_texts)
+            return
+        offset = len(self.texts)
+        self.texts.extend(new_texts)
+        self.rows.update({_doc_key(text): offset + i for i, text in enumerate(new_texts)})
+        self.matrix = sp.vstack([self.matrix, self.vectorizer.transform(new_texts)], format='csr')
+        self.added_since_fit += len(new_texts)
+
+    def scores(self, texts):
+        """Cosine similarity of each text to the JD via one sparse matrix-vector product"""
+        with self.lock:
+            self.update(texts)
+            # Rows are L2-normalised by the vectorizer, so the dot product is the cosine
+            all_scores = np.asarray((self.matrix @ self.jd_vector.T).todense()).ravel()
+            return np.array([all_scores[self.rows[_doc_key(text)]] for text in texts], dtype=np.float64)
+
+
+def _cache_model(key, jd_model):
+    with _cache_lock:
+        _cache[key] = jd_model
+        _cache.move_to_end(key)
+        if len(_cache) > MAX_CACHED_JDS:
+            _cache.popitem(last=False)
+
+
+def get_jd_model(jd_text):
+    """Return the cached TF-IDF model for a JD, creating it on first use"""
+    key = _doc_key(jd_text)
+    with _cache_lock:
+        jd_model = _cache.get(key)
+        if jd_model is None:
+            jd_model = JDTfidfModel(jd_text)
+            _cache[key] = jd_model
+            if len(_cache) > MAX_CACHED_JDS:
+                _cache.popitem(last=False)
+        else:
+            _cache.move_to_end(key)
+    return jd_model
+
+
+def compute_tfidf_similarities(jd_text, resume_texts):
+    """TF-IDF cosine similarity of one (expanded) JD against many (expanded) resumes"""
+    if not resume_texts:
+        return np.zeros(0)
+    try:
+        return get_jd_model(jd_text).scores(resume_texts)
+    except ValueError:
+        # Empty vocabulary, e.g. only stop words
+        return np.zeros(len(resume_texts))
+
+
+def refit_tfidf_similarities(jd_text, resume_texts):
+    """TF-IDF similarity of every text under one fresh fit on the JD plus exactly these texts.
+
+    Given a JD's whole applicant pool the result depends only on that pool, not on the
+    order applications arrived in or which process scored them. The fitted model
+    replaces the cached one so later incremental scoring starts from the full corpus.
+    """
+    if not resume_texts:
+        return np.zeros(0)
+    jd_model = JDTfidfModel(jd_text)
+    try:
+        jd_model.fit(resume_texts)
+    except ValueError:
+        return np.zeros(len(resume_texts))
+    _cache_model(_doc_key(jd_text), jd_model)
+    return jd_model.scores(resume_texts)
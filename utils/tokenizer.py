@@ -0,0 +1,45 @@
+import re
+
+# Punctuation nltk.word_tokenize always splits off, padded with str.translate in one C-level pass
+_PAD_PUNCTUATION = str.maketrans({c: f" {c} " for c in ";@#$%&?!*()[]{}<>\"`"})
+
+_TEXT_RULES = [
+    # Ellipses and double dashes stand alone
+    (re.compile(r"\.{2,}|--"), r" \g<0> "),
+    # Commas and colons split unless followed by a digit (1,000 / 10:30)
+    (re.compile(r"([:,])(?!\d)"), r" \1 "),
+    # Clitics and closing quotes: resume's -> resume 's, don't -> do n't
+    (re.compile(r"(?<=[^'\s])('s|'m|'d|'ll|'re|'ve|n't|')(?=\s|$)"), r" \1"),
+    # Opening single quote not starting a clitic
+    (re.compile(r"(?<!\S)'(?!(?:re|ve|ll|m|t|s|d|n)\b)(?=\w)"), r"' ")
+]
+# Period-final tokens, the only ones that need a per-token decision
+_PERIOD_FINAL = re.compile(r"(?<!\S)(\S*[^\s.])\.(?=\s|$)")
+
+# Punkt keeps the period on abbreviations and on numbers followed by a lowercase word
+ABBREVIATIONS = frozenset([
+    "e.g", "i.e", "etc", "vs", "inc", "ltd", "co", "corp", "dept", "approx", "est",
+    "mr", "mrs", "ms", "dr", "prof", "jr", "sr", "st", "no",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec"
+])
+_NUMBER = re.compile(r"^-?[.,]?\d[\d,.-]*$")
+
+
+def _split_period(match):
+    stem = match.group(1)
+    if stem in ABBREVIATIONS or _NUMBER.match(stem):
+        return match.group(0)
+    # Sentence-final period
+    return stem + " ."
+
+
+def fast_word_tokenize(text):
+    """nltk.word_tokenize-compatible tokens for cleaned ASCII text, using regex passes over the whole text instead of per-sentence Treebank rules"""
+    text = text.translate(_PAD_PUNCTUATION)
+    for regexp, substitution in _TEXT_RULES:
+        text = regexp.sub(substitution, text)
+    tokens = _PERIOD_FINAL.sub(_split_period, text).split()
+    # The last sentence always ends with its final period split off
+    if tokens and len(tokens[-1]) > 1 and tokens[-1][-1] == "." and tokens[-1][-2] != ".":
+        tokens[-1:] = [tokens[-1][:-1], "."]
+    return tokens
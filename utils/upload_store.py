@@ -0,0 +1,230 @@
+import os
+import re
+import hashlib
+import datetime
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+from pymongo.errors import PyMongoError
+from utils.resume_document import ResumeDocument, get_document, save_document, open_document
+
+# Uploaded PDFs live under their SHA-256, so identical files are stored (and parsed) once
+UPLOAD_ROOT = os.environ.get("UPLOAD_ROOT", "uploads")
+# Bump when an extractor changes so stored parses are recomputed on the next upload
+PARSE_VERSION = 1
+# Rejected before parsing: a huge or 200-page scanned PDF must not stall a worker
+MAX_UPLOAD_MB = float(os.environ.get("MAX_UPLOAD_MB", "10"))
+MAX_UPLOAD_BYTES = int(MAX_UPLOAD_MB * 1024 * 1024)
+MAX_UPLOAD_PAGES = int(os.environ.get("MAX_UPLOAD_PAGES", "20"))
+# Threads writing accepted uploads to disk off the request path
+UPLOAD_WRITERS = int(os.environ.get("UPLOAD_WRITERS", "2"))
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017")
+db = client["resume_ranking_db"]
+upload_collection = db["uploads"]
+
+_STORED_NAME = re.compile(r"^[0-9a-f]{64}\.pdf$")
+
+_writer = None
+_writer_lock = threading.Lock()
+# sha256 -> Future of a background write that has not finished yet
+_pending = {}
+
+
+def _get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=UPLOAD_WRITERS, thread_name_prefix="upload-writer")
+    return _writer
+
+
+def upload_path(sha256):
+    """uploads/ab/cd/<sha256>.pdf, two shard levels keep every directory small"""
+    return os.path.join(UPLOAD_ROOT, sha256[:2], sha256[2:4], f"{sha256}.pdf")
+
+
+def stored_name(sha256):
+    return f"{sha256}.pdf"
+
+
+def resolve_upload(name):
+    """Path of an upload from its stored name, or from the flat uploads/ layout used before hashing"""
+    name = os.path.basename(name or "")
+    if _STORED_NAME.match(name):
+        return upload_path(name[:-len(".pdf")])
+    return os.path.join(UPLOAD_ROOT, name)
+
+
+def _write_file(sha256, data):
+    path = upload_path(sha256)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so a concurrent request never reads a partial PDF
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def _record_upload(sha256, size, filename):
+    now = datetime.datetime.utcnow()
+    update = {
+        "$setOnInsert": {"path": upload_path(sha256), "size": size, "ref_count": 0, "created_at": now},
+        "$set": {"last_uploaded_at": now},
+        "$inc": {"upload_count": 1}
+    }
+    if filename:
+        update["$addToSet"] = {"filenames": filename}
+    try:
+        upload_collection.update_one({"_id": sha256}, update, upsert=True)
+    except PyMongoError as e:
+        print("⚠️ Upload record write failed:", e)
+
+
+def _write_in_background(sha256, data):
+    try:
+        _write_file(sha256, data)
+    except OSError as e:
+        print("❌ Upload write failed:", e)
+    finally:
+        with _writer_lock:
+            _pending.pop(sha256, None)
+
+
+def store_upload(data, filename=None, sha256=None, background=False):
+    """Write the bytes once under their content hash and record the upload, returns the sha256
+
+    The record is always upserted before returning, so the parse cache and reference
+    counts can update it at once; with background=True only the file write is deferred.
+    """
+    sha256 = sha256 or hashlib.sha256(data).hexdigest()
+    _record_upload(sha256, len(data), filename)
+    if not background:
+        _write_file(sha256, data)
+        return sha256
+    writer = _get_writer()
+    with _writer_lock:
+        _pending[sha256] = writer.submit(_write_in_background, sha256, data)
+    return sha256
+
+
+def flush_upload(sha256):
+    """Wait for a background write of these bytes, if one is still running"""
+    with _writer_lock:
+        future = _pending.get(sha256)
+    if future is not None:
+        future.result()
+
+
+def read_upload(stream):
+    """Request file bytes, reading at most one byte past the limit"""
+    data = stream.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise ValueError(f"Resume is larger than {MAX_UPLOAD_MB:g} MB")
+    if not data:
+        raise ValueError("Resume file is empty")
+    return data
+
+
+def add_reference(sha256):
+    """Count one more stored application pointing at this file"""
+    try:
+        upload_collection.update_one({"_id": sha256}, {"$inc": {"ref_count": 1}})
+    except PyMongoError as e:
+        print("⚠️ Upload reference update failed:", e)
+
+
+def add_references(sha256s):
+    """add_reference for a batch of applications in one bulk write"""
+    counts = Counter(sha256 for sha256 in sha256s if sha256)
+    if not counts:
+        return
+    try:
+        upload_collection.bulk_write([
+            UpdateOne({"_id": sha256}, {"$inc": {"ref_count": count}}) for sha256, count in counts.items()
+        ], ordered=False)
+    except PyMongoError as e:
+        print("⚠️ Upload reference update failed:", e)
+
+
+def _remove_upload(record):
+    # Re-checked in the filter: an application saved meanwhile keeps the file
+    if upload_collection.delete_one({"_id": record["_id"], "ref_count": {"$lte": 0}}).deleted_count:
+        if os.path.exists(record["path"]):
+            os.remove(record["path"])
+        return True
+    return False
+
+
+def release_reference(sha256, count=1):
+    """Drop deleted applications' references, removing the file and its record once nothing points at it"""
+    try:
+        record = upload_collection.find_one_and_update(
+            {"_id": sha256}, {"$inc": {"ref_count": -count}}, return_document=ReturnDocument.AFTER
+        )
+        return bool(record and record["ref_count"] <= 0 and _remove_upload(record))
+    except PyMongoError as e:
+        print("⚠️ Upload reference release failed:", e)
+        return False
+
+
+def prune_unreferenced(older_than_hours=24):
+    """Remove uploads no application points at (forms never submitted), returns how many were removed"""
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(hours=older_than_hours)
+    records = upload_collection.find({"ref_count": {"$lte": 0}, "last_uploaded_at": {"$lte": cutoff}}, {"path": 1})
+    return sum(_remove_upload(record) for record in records)
+
+
+def parse_upload(sha256, document=None):
+    """parse_resume output for stored bytes, running the extractors only the first time they arrive"""
+    try:
+        record = upload_collection.find_one({"_id": sha256, "parse_version": PARSE_VERSION}, {"parsed_data": 1})
+    except PyMongoError as e:
+        print("⚠️ Upload record read failed:", e)
+        record = None
+    if record and record.get("parsed_data"):
+        print("✅ Reusing stored parse for", sha256[:12])
+        return record["parsed_data"]
+
+    from utils.resume_parser import parse_document
+
+    if document is None:
+        flush_upload(sha256)
+        document = open_document(upload_path(sha256))
+    parsed_data = parse_document(document)
+    try:
+        upload_collection.update_one(
+            {"_id": sha256}, {"$set": {"parsed_data": parsed_data, "parse_version": PARSE_VERSION}}
+        )
+    except PyMongoError as e:
+        print("⚠️ Upload parse write failed:", e)
+    return parsed_data
+
+
+def accept_upload(stream, filename=None):
+    """Parse an uploaded PDF straight from the request stream, enforcing the size and page limits.
+
+    The bytes are written to their sharded path in the background, returns (sha256, parsed_data).
+    Raises ValueError for an oversized, too long or unreadable PDF.
+    """
+    data = read_upload(stream)
+    sha256 = hashlib.sha256(data).hexdigest()
+    document = get_document(sha256)
+    if document is None:
+        try:
+            document = ResumeDocument.from_bytes(data, sha256, max_pages=MAX_UPLOAD_PAGES)
+        except ValueError:
+            raise
+        except Exception as e:
+            # PyMuPDF raises its own error types for corrupt or non-PDF data
+            raise ValueError("Resume is not a readable PDF") from e
+        save_document(document)
+    elif document.page_count > MAX_UPLOAD_PAGES:
+        raise ValueError(f"PDF has {document.page_count} pages, the limit is {MAX_UPLOAD_PAGES}")
+
+    store_upload(data, filename, sha256=sha256, background=True)
+    return sha256, parse_upload(sha256, document)